@@ -0,0 +1,33 @@
+"""
+Measures the throughput and memory used when building chained expectations.
+
+    PYTHONPATH=. python benchmarks/expectation_alloc.py [count]
+"""
+import sys
+import time
+import tracemalloc
+
+from pyshould.dsl import should
+
+
+def build(count):
+    return [should.be_an_int.and_greater_than(i).or_be_none for i in range(count)]
+
+
+def main(count):
+    start = time.perf_counter()
+    build(count)
+    elapsed = time.perf_counter() - start
+    print('throughput: {0:,.0f} chains/s ({1:.2f}s for {2:,})'.format(
+        count / elapsed, elapsed, count))
+
+    tracemalloc.start()
+    chains = build(count)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('    memory: {0:.1f} bytes per chain ({1:.1f} MB peak)'.format(
+        current / len(chains), peak / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,36 @@
+"""
+Measures the per-access cost of resolving `should.xxx` attribute chains,
+with the parsed names cache enabled and disabled.
+
+    PYTHONPATH=. python benchmarks/getattr.py
+"""
+import timeit
+
+from pyshould import expectation
+from pyshould.dsl import should
+
+
+NAMES = ('be_an_int', 'and_not_be_greater_than', 'or_equal', 'But_Not_be_a_float')
+NUMBER = 100000
+
+
+def access():
+    for name in NAMES:
+        getattr(should, name)
+
+
+def access_uncached():
+    for name in NAMES:
+        expectation._parsed_names.clear()
+        getattr(should, name)
+
+
+def main():
+    for label, fn in (('cached', access), ('uncached', access_uncached)):
+        elapsed = min(timeit.repeat(fn, number=NUMBER, repeat=3))
+        per_access = elapsed / (NUMBER * len(NAMES)) * 1e9
+        print('{0:>10}: {1:8.1f} ns per access'.format(label, per_access))
+
+
+if __name__ == '__main__':
+    main()
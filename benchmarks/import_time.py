@@ -0,0 +1,69 @@
+"""
+Measures the startup cost of pyshould using `python -X importtime` in fresh
+interpreters: the time to import the package, the modules taking the most
+of it and the time to resolve the first expectation, which loads hamcrest
+and the catalogue of matchers.
+
+    PYTHONPATH=. python benchmarks/import_time.py [runs]
+"""
+import sys
+import subprocess
+
+
+RUNS = 10
+TOP = 10
+
+FIRST_USE = '''
+import time
+start = time.perf_counter()
+from pyshould import should
+1 | should.eq(1)
+print(time.perf_counter() - start)
+'''
+
+
+def importtime(code):
+    """ Runs the code in a new interpreter returning the cumulative import
+        time in microseconds of each top level module and the output.
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.split('|')
+        modules[name.strip()] = (int(own.split(':')[1]), int(cumulative), name.strip())
+    return modules, proc.stdout
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(runs):
+    # Warm up the bytecode caches
+    importtime('import pyshould')
+
+    totals = []
+    for _ in range(runs):
+        modules, _ = importtime('import pyshould')
+        totals.append(modules['pyshould'][1])
+    print('import pyshould: {0:.1f} ms (median of {1})'.format(median(totals) / 1e3, runs))
+
+    print('\nSlowest modules (self time):')
+    slowest = sorted(modules.values(), reverse=True)[:TOP]
+    for own, cumulative, name in slowest:
+        print('  {0:8.1f} ms  {1}'.format(own / 1e3, name))
+
+    first = []
+    for _ in range(runs):
+        _, output = importtime(FIRST_USE)
+        first.append(float(output))
+    print('\nimport and first expectation: {0:.1f} ms (median of {1})'.format(
+        median(first) * 1e3, runs))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS)
@@ -0,0 +1,85 @@
+"""
+Measures the lookup throughput of the matchers registry with an increasing
+number of threads, while a writer keeps registering and unregistering an
+alias. Lookups read the current snapshot without locking; the `locked` rows
+serialize them with a global lock as a baseline. On free-threaded Python the
+lock-free throughput should grow with the number of cores.
+
+    PYTHONPATH=. python benchmarks/registry_threads.py [lookups per thread]
+"""
+import os
+import sys
+import threading
+import time
+
+from pyshould import matchers
+
+
+ALIASES = ('be_an_integer', 'be_greater_than', 'equal', 'have_length',
+           'contain_the_substring', 'be_a_string', 'throw', 'pass_callback')
+LOOKUPS = 200000
+
+
+def lookups(count, lock=None):
+    lookup = matchers.lookup
+    aliases = ALIASES * (count // len(ALIASES))
+    if lock is None:
+        for alias in aliases:
+            lookup(alias)
+    else:
+        for alias in aliases:
+            with lock:
+                lookup(alias)
+
+
+def writer(stop):
+    while not stop.is_set():
+        matchers.register(matchers.IsTrue, 'be_a_benchmark_truth')
+        matchers.unregister('be_a_benchmark_truth')
+        time.sleep(0.001)
+    matchers.register(matchers.IsTrue, 'be_true')
+
+
+def measure(threads, count, lock=None):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        lookups(count, lock)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LOOKUPS
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('GIL enabled: {0}, CPUs: {1}'.format(gil, os.cpu_count()))
+
+    stop = threading.Event()
+    background = threading.Thread(target=writer, args=(stop,))
+    background.start()
+    try:
+        lock = threading.Lock()
+        threads = 1
+        while threads <= max(os.cpu_count() or 1, 1):
+            for label, used in (('lock-free', None), ('locked', lock)):
+                rate = measure(threads, count, used)
+                print('{0:>10} {1:3d} threads: {2:12,.0f} lookups/s'.format(
+                    label, threads, rate))
+            threads *= 2
+    finally:
+        stop.set()
+        background.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
 """
-Prints the configured matchers when run with `python -m pyshould`
+Prints the configured matchers when run with `python -m pyshould`, or runs
+the benchmarks with `python -m pyshould bench` (see pyshould.bench).
 """
+import sys
 
-def main():
+
+def catalogue():
     from pyshould.matchers import lookup, aliases, alias_help
     group = {}
     for alias in aliases():
@@ -18,4 +21,13 @@ def main():
         ))
 
 
-main()
+def main(argv):
+    if argv[:1] == ['bench']:
+        from pyshould.bench import main as bench
+        return bench(argv[1:])
+
+    catalogue()
+    return 0
+
+
+sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,320 @@
+"""
+Support for asyncio. Awaitable subjects are awaited before resolving the
+expectation, which is evaluated on a worker thread so slow matchers do not
+block the event loop. Callbacks returning awaitables (ie: async functions)
+are scheduled back on the running loop and waited for from that thread.
+Inside a loop the pipe operator defers those expectations, returning a
+coroutine which warns if it's discarded without awaiting it.
+
+Quantified expectations also accept async iterables, their items are checked
+concurrently as they arrive. Async callbacks are awaited on the loop itself,
+so the number of items in flight is bounded by a semaphore and not by the
+worker threads, and once the outcome is known the pending checks are
+cancelled.
+"""
+import asyncio
+import inspect
+import warnings
+import contextvars
+from collections.abc import Coroutine
+
+from hamcrest.core.core.allof import AllOf
+from hamcrest.core.core.anyof import AnyOf
+from hamcrest.core.core.isnot import IsNot
+
+from .matchers import ContextManagerResult
+from .catalogue import Callback
+from . import description
+from . import instrument
+from .description import BoundedDescription
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Event loop on which the expectation being resolved was awaited
+_loop = contextvars.ContextVar('pyshould_loop', default=None)
+
+# Items of an async iterable checked at once unless configured with `parallel`
+DEFAULT_CONCURRENCY = 16
+
+# Marks the end of an async iterable
+_END = object()
+
+
+class Resolution(Coroutine):
+    """ Coroutine resolving an expectation, which warns when it's discarded
+        without being awaited since the expectation was not checked at all.
+    """
+
+    def __init__(self, coroutine):
+        self._coroutine = coroutine
+        self._started = False
+
+    def __await__(self):
+        self._started = True
+        return self._coroutine.__await__()
+
+    def send(self, value):
+        self._started = True
+        return self._coroutine.send(value)
+
+    def throw(self, *args):
+        self._started = True
+        return self._coroutine.throw(*args)
+
+    def close(self):
+        self._started = True
+        return self._coroutine.close()
+
+    def __del__(self):
+        if not self._started:
+            self._coroutine.close()
+            warnings.warn('Expectation never awaited so it was not checked. '
+                          'Use: await (<value> | should.<matcher>)', RuntimeWarning)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def run(awaitable):
+    """ Waits for an awaitable from synchronous code, like matchers do. When
+        resolving an awaited expectation it runs on the loop that awaited it,
+        otherwise a new loop is used if none is running in this thread.
+    """
+    loop = _loop.get()
+    if loop is not None:
+        return asyncio.run_coroutine_threadsafe(_await(awaitable), loop).result()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await(awaitable))
+
+    if inspect.iscoroutine(awaitable):
+        awaitable.close()
+    raise RuntimeError(
+        'Unable to wait for an awaitable without blocking the running loop. '
+        'Use: await (<value> | should.<matcher>)')
+
+
+async def run_sync(fn, *args):
+    """ Runs a synchronous function on the loop's executor making the running
+        loop available to any awaitable it needs to wait for.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    context.run(_loop.set, loop)
+    return await loop.run_in_executor(None, context.run, fn, *args)
+
+
+async def resolve(expectation, value):
+    """ Resolves the expectation once the value is available """
+    if inspect.isawaitable(value):
+        value = await value
+
+    await run_sync(expectation.resolve, value)
+    return expectation
+
+
+async def resolve_items(expectation, value):
+    """ Resolves a quantified expectation, consuming the value if it's an
+        async iterable.
+    """
+    if inspect.isawaitable(value):
+        value = await value
+
+    if not hasattr(value, '__aiter__'):
+        return await resolve(expectation, value)
+
+    if instrument.listeners:
+        with instrument.observe(expectation):
+            return await _resolve_items(expectation, value)
+    return await _resolve_items(expectation, value)
+
+
+async def _resolve_items(expectation, value):
+    try:
+        if expectation.matcher:
+            expectation._init_matcher()
+        quantifier = expectation._quantify(expectation.evaluate())
+
+        limit = DEFAULT_CONCURRENCY
+        if expectation.parallelism:
+            limit = expectation.parallelism.workers
+
+        transform = expectation._transform_item if expectation.transform else None
+        result, report = await check_items(quantifier, value, limit, transform)
+        if not result:
+            from .expectation import failure
+            mismatch = await run_sync(_describe, quantifier, report)
+            raise failure(quantifier, mismatch)
+    finally:
+        if expectation.deferred:
+            expectation.reset()
+
+    return expectation
+
+
+async def check_items(quantifier, items, limit, transform=None):
+    """ Checks the items of an async iterable with the quantifier, up to
+        `limit` of them at once. Like the parallel evaluation the earliest
+        decisive item wins, so the outcome is the same the sequential one
+        would report, and once known the items after it are cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(limit)
+    stop = asyncio.Event()
+    iterator = items.__aiter__()
+
+    pending = {}
+    firsts = {}
+    max_firsts = description.current().max_failures
+    decided = None
+    outcome = None
+    count = 0
+
+    async def check(index, item):
+        try:
+            value = transform(item) if transform else item
+            return value, await matches(quantifier.matcher, value)
+        finally:
+            semaphore.release()
+
+    def done(task):
+        nonlocal decided, outcome
+        index = pending.pop(task)
+        if task.cancelled() or (decided is not None and index > decided):
+            return
+
+        # Errors are decisive too, as they would stop a sequential check
+        error = task.exception()
+        if error is None:
+            value, matched = task.result()
+            if bool(matched) is not quantifier.stops_on:
+                if index < max_firsts:
+                    firsts[index] = value
+                return
+            error = quantifier._item_outcome(index, value)
+
+        decided, outcome = index, error
+        stop.set()
+        for other, other_index in list(pending.items()):
+            if other_index > index:
+                other.cancel()
+
+    try:
+        while True:
+            await semaphore.acquire()
+            item = _END
+            if not stop.is_set():
+                item = await _next(iterator, stop if pending else None)
+            if item is _END or stop.is_set():
+                semaphore.release()
+                break
+
+            task = loop.create_task(check(count, item))
+            pending[task] = count
+            task.add_done_callback(done)
+            count += 1
+
+        while pending:
+            await asyncio.wait(list(pending))
+    finally:
+        for task in list(pending):
+            task.cancel()
+
+    if isinstance(outcome, BaseException):
+        raise outcome
+    if outcome is not None:
+        return outcome
+    return quantifier._exhausted(count, [firsts[i] for i in sorted(firsts)])
+
+
+async def _next(iterator, stop=None):
+    """ Obtains the next item of an async iterator or _END when there are no
+        more. If the stop event is set while waiting for it gives up.
+    """
+    if stop is None:
+        try:
+            return await iterator.__anext__()
+        except StopAsyncIteration:
+            return _END
+
+    fetch = asyncio.ensure_future(iterator.__anext__())
+    waiter = asyncio.ensure_future(stop.wait())
+    try:
+        await asyncio.wait((fetch, waiter), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+    if not fetch.done():
+        fetch.cancel()
+        return _END
+
+    try:
+        return fetch.result()
+    except StopAsyncIteration:
+        return _END
+
+
+async def matches(matcher, item):
+    """ Checks an item against a matcher. Async callbacks are awaited on the
+        loop, looking into the logical matchers to find them, while the rest
+        of matchers are run on a worker thread.
+    """
+    if isinstance(matcher, Callback) and inspect.iscoroutinefunction(matcher.callback):
+        matcher.error = None
+        try:
+            return matcher._accepts(await matcher.callback(item))
+        except AssertionError:
+            raise
+        except Exception as ex:
+            matcher.error = str(ex)
+            return False
+
+    if isinstance(matcher, AllOf):
+        for m in matcher.matchers:
+            if not await matches(m, item):
+                return False
+        return True
+
+    if isinstance(matcher, AnyOf):
+        for m in matcher.matchers:
+            if await matches(m, item):
+                return True
+        return False
+
+    if isinstance(matcher, IsNot):
+        return not await matches(matcher.matcher, item)
+
+    return bool(await run_sync(matcher.matches, item))
+
+
+def _describe(quantifier, report):
+    # Check a failed item again so stateful matchers (ie: callbacks) describe
+    # it and not the last item checked concurrently.
+    if report[0] == 'failed' and not quantifier.parallelism:
+        quantifier.matcher.matches(report[2])
+
+    mismatch = BoundedDescription()
+    quantifier._describe(report, mismatch)
+    return mismatch
+
+
+async def enter(expectation):
+    return expectation.__enter__()
+
+
+async def exit(expectation, exc, value, trace):
+    expr = expectation._exit_context()
+
+    # If an assertion failed inside the block just raise that one
+    if isinstance(value, AssertionError):
+        return False
+
+    result = ContextManagerResult(exc, value, trace)
+    await run_sync(expr.resolve, result)
+    return True
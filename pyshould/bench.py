@@ -0,0 +1,418 @@
+"""
+Benchmarks for the hot paths of pyshould, run them with:
+
+    python -m pyshould bench [-k PATTERN] [--save FILE] [--compare FILE]
+
+Each benchmark reports the best time per operation among several repetitions.
+Results can be saved as a JSON baseline and compared later against it, in
+which case the command exits with an error status when any benchmark is
+slower than the baseline by more than the threshold. Benchmarks changing
+the whole process (ie: `patched`) run in their own one.
+"""
+import os
+import sys
+import json
+import timeit
+import subprocess
+import platform
+import argparse
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Registered benchmarks as (name, setup) in the order they run. The setup
+# function prepares the data and returns the callable to measure, or None
+# when the benchmark is not available (ie: optional dependencies).
+BENCHMARKS = []
+
+# Names of the benchmarks run in their own process, since they change the
+# whole process (ie: patching object) and would distort the ones after them
+ISOLATED = set()
+
+# Default relative slowdown tolerated when comparing against a baseline
+THRESHOLD = 0.2
+
+# Version of the baseline files format
+FORMAT = 1
+
+
+def benchmark(name, isolated=False):
+    """ Decorator registering a benchmark setup function """
+    def decorator(setup):
+        BENCHMARKS.append((name, setup))
+        if isolated:
+            ISOLATED.add(name)
+        return setup
+    return decorator
+
+
+@benchmark('getattr')
+def bench_getattr():
+    from .dsl import should
+
+    def run():
+        should.be_an_int.and_not_be_greater_than
+    return run
+
+
+@benchmark('getattr_uncached')
+def bench_getattr_uncached():
+    from .dsl import should
+    from .expectation import _parsed_names
+
+    def run():
+        _parsed_names.clear()
+        should.be_an_int.and_not_be_greater_than
+    return run
+
+
+@benchmark('lookup')
+def bench_lookup():
+    from .matchers import lookup
+
+    def run():
+        lookup('be_greater_than')
+    return run
+
+
+@benchmark('lookup_uncached')
+def bench_lookup_uncached():
+    from . import matchers
+
+    def run():
+        matchers._registry.resolved.clear()
+        matchers.lookup('to_be_greater_than')
+    return run
+
+
+@benchmark('normalize')
+def bench_normalize():
+    from .matchers import normalize
+
+    def run():
+        normalize('ToBeAnInstanceOf')
+    return run
+
+
+@benchmark('evaluate_chain')
+def bench_evaluate_chain():
+    from .dsl import should
+
+    chain = should.be_an_int
+    for i in range(16):
+        chain = chain.and_greater_than(-i).or_equal(i)
+
+    return chain.evaluate
+
+
+@benchmark('pipe')
+def bench_pipe():
+    from .dsl import should
+
+    def run():
+        5 | should.be_an_int.and_greater_than(3)
+    return run
+
+
+@benchmark('pipe_compiled')
+def bench_pipe_compiled():
+    from .dsl import should
+    checker = should.be_an_int.and_greater_than(3).compile()
+
+    def run():
+        5 | checker
+    return run
+
+
+@benchmark('quantifier_list')
+def bench_quantifier_list():
+    from .dsl import should_all
+    values = list(range(10000))
+
+    def run():
+        values | should_all.be_an_int
+    return run
+
+
+@benchmark('quantifier_generator')
+def bench_quantifier_generator():
+    from .dsl import should_none
+
+    def run():
+        (x for x in range(10000)) | should_none.be_less_than(0)
+    return run
+
+
+@benchmark('quantifier_regex')
+def bench_quantifier_regex():
+    from .dsl import should_all
+    lines = ['2024-01-01 12:00:00 INFO request %d served' % i for i in range(10000)]
+
+    def run():
+        lines | should_all.match(r'^\d{4}-\d\d-\d\d [\d:]+ (INFO|WARN) ')
+    return run
+
+
+@benchmark('quantifier_numpy')
+def bench_quantifier_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    from .dsl import should_all
+    values = numpy.arange(1000000)
+
+    def run():
+        values | should_all.be_an_instance_of(numpy.integer).and_greater_than(-1)
+    return run
+
+
+@benchmark('contain_literals')
+def bench_contain_literals():
+    from .dsl import should
+    values = list(range(200))
+    shuffled = values[::2] + values[1::2]
+    checker = (should.contain_in_any_order(*shuffled).and_contain(*values)
+               .and_have_the_items(*shuffled[:50]).and_have_only(*values)).compile()
+
+    def run():
+        values | checker
+    return run
+
+
+@benchmark('contain_sparse')
+def bench_contain_sparse():
+    from .dsl import should
+    values = list(range(10000))
+    checker = should.contain_sparse_in_order(10, should.be_greater_than(9998)).compile()
+
+    def run():
+        values | checker
+    return run
+
+
+@benchmark('have_props')
+def bench_have_props():
+    from .dsl import should, should_all
+
+    class Model(object):
+        def __init__(self, pk):
+            self.pk = pk
+            self.name = 'model %d' % pk
+            for i in range(50):
+                setattr(self, 'field%d' % i, i)
+
+        @property
+        def label(self):
+            return self.name.upper()
+
+    models = [Model(i) for i in range(1000)]
+    checker = should_all.have_props(pk=should.be_int(), label=should.be_str()).compile()
+
+    def run():
+        models | checker
+    return run
+
+
+@benchmark('eq_diff')
+def bench_eq_diff():
+    from .dsl import should
+    expected = 'lorem ipsum dolor sit amet\n' * 40000
+    actual = expected[:500000] + 'lorem ipsum dolor sat amet' + expected[500026:]
+    checker = should.eq(expected).compile()
+
+    def run():
+        try:
+            actual | checker
+        except AssertionError:
+            pass
+    return run
+
+
+@benchmark('deep_equal')
+def bench_deep_equal():
+    from .dsl import should
+    expected = {'items': [{'id': i, 'price': i * 1.5, 'tags': ['a', 'b'], 'meta': {'ts': i}}
+                          for i in range(2000)]}
+    actual = {'items': [dict(item, meta={'ts': 0}) for item in expected['items']]}
+    actual['items'][1500]['price'] += 0.001
+    checker = should.deep_equal(expected, ignore=['$..ts'], tolerance=0.01).compile()
+
+    def run():
+        actual | checker
+    return run
+
+
+@benchmark('eq_mock')
+def bench_eq_mock():
+    try:
+        from unittest import mock
+    except ImportError:
+        return None
+
+    from .dsl import should
+    m = mock.Mock()
+    m(5, 'foo')
+
+    def run():
+        m.assert_called_with(should.be_an_int, should.be_a_string)
+    return run
+
+
+@benchmark('eq_mismatch')
+def bench_eq_mismatch():
+    from .dsl import should
+
+    def run():
+        'foo' == should.be_an_int
+    return run
+
+
+@benchmark('patched', isolated=True)
+def bench_patched():
+    from . import patch
+    if not patch.is_cpython:
+        return None
+
+    def run():
+        (5).should.be_an_int()
+    return run
+
+
+def measure(fn, repeat=5):
+    """ Obtains the best time per call in nanoseconds. The number of calls
+        per repetition is calibrated to last at least 0.2 seconds, after a
+        first call warming up lazy imports and caches.
+    """
+    fn()
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    times = [elapsed] + timer.repeat(repeat - 1, number)
+    return min(times) / number * 1e9
+
+
+def measure_named(name, repeat=5):
+    """ Obtains the time per call of a benchmark, None if not available """
+    setup = dict(BENCHMARKS)[name]
+    fn = setup()
+    return None if fn is None else measure(fn, repeat)
+
+
+def _measure_isolated(name, repeat):
+    """ Runs `measure_named` in a new process """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (root, env.get('PYTHONPATH'))))
+    code = ('import json; from pyshould import bench; '
+            'print(json.dumps(bench.measure_named({0!r}, {1:d})))').format(name, repeat)
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return json.loads(output.decode())
+
+
+def run(pattern=None, repeat=5, out=None):
+    """ Runs the benchmarks whose name contains the pattern, returning a
+        dict of name:nanoseconds. Progress is written to `out` if given.
+    """
+    results = {}
+    for name, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+
+        if name in ISOLATED:
+            result = _measure_isolated(name, repeat)
+        else:
+            fn = setup()
+            result = None if fn is None else measure(fn, repeat)
+
+        if result is None:
+            if out:
+                out.write('{0:<22} skipped\n'.format(name))
+            continue
+
+        results[name] = result
+        if out:
+            out.write('{0:<22} {1:>14}\n'.format(name, _format(results[name])))
+            out.flush()
+
+    return results
+
+
+def save(results, path):
+    """ Stores the results as a JSON baseline """
+    data = {
+        'format': FORMAT,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+    with open(path, 'w') as fd:
+        json.dump(data, fd, indent=2, sort_keys=True)
+
+
+def load(path):
+    """ Loads the results from a JSON baseline """
+    with open(path) as fd:
+        data = json.load(fd)
+
+    if data.get('format') != FORMAT:
+        raise ValueError('Unsupported baseline format in {0}'.format(path))
+    return data['results']
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """ Obtains the benchmarks slower than the baseline by more than the
+        threshold as a list of (name, baseline, current) tuples.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is not None and current > base * (1 + threshold):
+            regressions.append((name, base, current))
+    return regressions
+
+
+def _format(ns):
+    if ns >= 1e6:
+        return '{0:.2f} ms'.format(ns / 1e6)
+    if ns >= 1e3:
+        return '{0:.2f} us'.format(ns / 1e3)
+    return '{0:.1f} ns'.format(ns)
+
+
+def main(argv=None, out=sys.stdout):
+    parser = argparse.ArgumentParser(
+        prog='python -m pyshould bench',
+        description='Benchmarks the hot paths of pyshould')
+    parser.add_argument('-k', dest='pattern',
+                        help='only run benchmarks whose name contains PATTERN')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='repetitions of each benchmark (default: 5)')
+    parser.add_argument('--save', metavar='FILE',
+                        help='store the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare the results against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD * 100,
+                        help='tolerated slowdown in percent (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    # Load it first to fail early if it's not valid
+    baseline = load(args.compare) if args.compare else None
+
+    results = run(args.pattern, args.repeat, out)
+
+    if args.save:
+        save(results, args.save)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold / 100.0)
+        for name, base, current in regressions:
+            out.write('REGRESSION {0}: {1} -> {2} ({3:+.0f}%)\n'.format(
+                name, _format(base), _format(current), (current / base - 1) * 100))
+        if regressions:
+            return 1
+        out.write('No regressions above {0:g}%\n'.format(args.threshold))
+
+    return 0
@@ -0,0 +1,1235 @@
+"""
+The standard set of matchers. It's loaded on the first use of the registry,
+so importing pyshould does not pay for importing hamcrest and defining all
+the matchers until an expectation needs them.
+"""
+
+import re
+import inspect
+import pickle
+import hashlib
+import weakref
+from copy import copy, deepcopy
+from collections import Counter
+from collections.abc import Sequence, Set
+from functools import lru_cache
+from operator import attrgetter
+from datetime import datetime, date
+import hamcrest as hc
+from hamcrest.core.base_matcher import BaseMatcher
+from hamcrest.core.core.isequal import IsEqual
+from hamcrest.library.collection.isdict_containingentries import IsDictContainingEntries
+from hamcrest.library.collection.issequence_containing import IsSequenceContainingEvery
+from hamcrest.library.collection.issequence_containinginanyorder import IsSequenceContainingInAnyOrder
+from hamcrest.library.collection.issequence_containinginorder import IsSequenceContainingInOrder
+from hamcrest.library.collection.issequence_onlycontaining import IsSequenceOnlyContaining
+from hamcrest.core.helpers.wrap_matcher import wrap_matcher
+
+from .matchers import _register as register, ContextManagerResult
+from . import diff, deep
+
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+class IsEqualWithDiff(IsEqual):
+    """ Equality matcher describing where long strings and sequences differ """
+
+    def describe_mismatch(self, item, mismatch_description):
+        # The differences go first so truncating a long value keeps them
+        if diff.diffable(self.object, item):
+            diff.describe(self.object, item, mismatch_description)
+            mismatch_description.append_text('\n          ')
+        super(IsEqualWithDiff, self).describe_mismatch(item, mismatch_description)
+
+
+def equal_to(obj):
+    """Matches if object is equal to a given object. The differences of long
+    strings and sequences are described on a mismatch.
+    """
+    return IsEqualWithDiff(obj)
+
+
+# Matchers should be defined with verbose aliases to allow the use of
+# natural english where possible. When looking up a matcher common adverbs
+# like 'to', 'be' or 'is' are ignored in the comparison.
+register(equal_to,
+         'be_equal_to', 'be_equals_to', 'be_eql_to', 'be_eq_to')
+register(hc.instance_of,
+         'be_an_instance_of', 'be_a', 'be_an')
+register(hc.same_instance,
+         'be_the_same_instance_as', 'be_the_same_as', 'be')
+
+register(hc.has_entry,
+         'have_the_entry', 'contain_the_entry')
+register(hc.has_entries,
+         'have_the_entries', 'contain_the_entries')
+register(hc.has_key,
+         'have_the_key', 'contain_the_key')
+register(hc.has_value,
+         'have_the_value', 'contain_the_value')
+register(hc.is_in,
+         'be_in', 'be_into', 'be_contained_in')
+register(hc.has_item,
+         'have_the_item', 'contain_the_item')
+register(hc.close_to,
+         'be_close_to')
+register(hc.greater_than,
+         'be_greater_than', 'be_greater', 'be_gt',
+         'be_above',
+         'be_more_than', 'be_more')
+register(hc.greater_than_or_equal_to,
+         'be_greater_than_or_equal_to', 'be_greater_or_equal', 'be_ge',
+         'be_more_than_or_equal', 'be_more_or_equal',
+         'be_at_least')
+register(hc.less_than,
+         'be_less_than', 'be_less', 'be_lt', 'be_below')
+register(hc.less_than_or_equal_to,
+         'be_less_than_or_equal_to', 'be_less_or_equal', 'be_le',
+         'be_at_most')
+register(hc.has_length,
+         'have_length', 'have_len')
+register(hc.has_property,
+         'have_the_property', 'contain_the_property',
+         'have_the_prop', 'contain_the_prop')
+register(hc.has_string,
+         'have_the_string', 'contain_the_string')
+register(hc.equal_to_ignoring_case,
+         'be_equal_to_ignoring_case')
+register(hc.equal_to_ignoring_whitespace,
+         'be_equal_to_ignoring_whitespace')
+register(hc.contains_string,
+         'substr', 'have_the_substr', 'contain_the_substr',
+         'substring', 'have_the_substring', 'contain_the_substring')
+register(hc.ends_with,
+         'end_with')
+register(hc.starts_with,
+         'start_with', 'begin_with')
+register(hc.anything,
+         'be_anything', 'be_any')
+
+
+class TypeMatcher(BaseMatcher):
+    def _matches(self, item):
+        return isinstance(item, self.__class__.types)
+
+    def describe_to(self, description):
+        description.append_text(self.__class__.expected)
+
+    def describe_mismatch(self, item, description):
+        description.append_text('was a %s ' % item.__class__.__name__)
+        description.append_description_of(item)
+
+    @classmethod
+    def __call__(cls, *args, **kwargs):
+        return cls()
+
+
+class IsInteger(TypeMatcher):
+    """ Check if the value is an integer """
+    try:
+        types = (int, long)
+    except:
+        types = (int)  # Python 3
+    expected = 'an integer'
+
+
+class IsFloat(TypeMatcher):
+    """ Check if the value is a float """
+    types = float
+    expected = 'a float'
+
+
+class IsComplex(TypeMatcher):
+    """ Check if the value is a complex number """
+    types = complex
+    expected = 'a complex number'
+
+
+class IsNumeric(TypeMatcher):
+    """ Check if the value is a numeric type """
+    try:
+        types = (int, long, float, complex)  # python 2
+    except NameError:
+        types = (int, float, complex)
+
+    expected = 'a numeric type'
+
+
+class IsString(TypeMatcher):
+    """ Check if the value is a string """
+    types = str
+    expected = 'a string'
+
+
+class IsStr(TypeMatcher):
+    """ Check if the value is a str """
+    types = str
+
+    expected = 'a str'
+
+
+class IsUnicode(TypeMatcher):
+    """ Check if the value is an unicode string """
+    types = str
+
+    expected = 'a unicode string'
+
+
+class IsBinary(TypeMatcher):
+    """ Check if value is a binary string """
+    try:
+        types = bytes  # python 3
+    except NameError:
+        types = str
+
+    expected = 'a binary string'
+
+
+class IsByteArray(TypeMatcher):
+    """ Check if the value is a bytearray """
+    types = bytearray
+    expected = 'a bytearray'
+
+
+class IsDict(TypeMatcher):
+    """ Check if the value is a dict """
+    types = dict
+    expected = 'a dict'
+
+
+class IsList(TypeMatcher):
+    """ Check if the value is a list """
+    types = list
+    expected = 'a list'
+
+
+class IsTuple(TypeMatcher):
+    """ Check if the value is a tuple """
+    types = tuple
+    expected = 'a tuple'
+
+
+class IsSet(TypeMatcher):
+    """ Check if the value is a set """
+    types = set
+    expected = 'a set'
+
+
+class IsFrozenSet(TypeMatcher):
+    """ Check if the value is a frozenset """
+    types = frozenset
+    expected = 'a frozenset'
+
+
+class IsBool(TypeMatcher):
+    """ Check if the value is a bool """
+    types = bool
+    expected = 'a bool'
+
+
+class IsFunction(TypeMatcher):
+    """ Check if the value is a function """
+    import types
+    types = types.FunctionType
+    expected = 'a function'
+
+
+class IsGenerator(BaseMatcher):
+    """ Checks if the value is a generator function """
+    def _matches(self, item):
+        import inspect
+        return inspect.isgeneratorfunction(item)
+
+    def describe_to(self, desc):
+        desc.append_text('a generator function')
+
+
+class IsClass(BaseMatcher):
+    """ Check if the value is a class """
+    def _matches(self, item):
+        import inspect
+        return inspect.isclass(item)
+
+    def describe_to(self, desc):
+        desc.append_text('a class')
+
+
+class IsDate(TypeMatcher):
+    """ Check if the value is a date """
+    types = (datetime, date)
+    expected = 'a date'
+
+
+register(IsInteger, 'be_an_integer', 'be_an_int')
+register(IsFloat, 'be_a_float')
+register(IsComplex, 'be_a_complex_number', 'be_a_complex')
+register(IsNumeric, 'be_numeric')
+register(IsString, 'be_a_string')
+register(IsStr, 'be_a_str')
+register(IsUnicode, 'be_an_unicode_string', 'be_an_unicode')
+register(IsBinary, 'be_a_binary_string', 'be_a_binary')
+register(IsByteArray, 'be_a_bytearray', 'be_a_byte_array')
+register(IsDict, 'be_a_dictionary', 'be_a_dict')
+register(IsList, 'be_a_list', 'be_an_array')
+register(IsTuple, 'be_a_tuple')
+register(IsSet, 'be_a_set')
+register(IsFrozenSet, 'be_a_frozenset', 'be_a_frozen_set')
+register(IsFunction, 'be_a_function', 'be_a_func')
+register(IsBool, 'be_a_boolean', 'be_a_bool')
+register(IsGenerator, 'be_a_generator')
+register(IsClass, 'be_a_class')
+register(IsDate, 'be_a_date')
+
+
+class IsIterable(BaseMatcher):
+    """ Checks if a value is iterable """
+    def _matches(self, item):
+        try:
+            iter(item)
+            return True
+        except TypeError:
+            return False
+
+    def describe_to(self, description):
+        description.append_text('an iterable value')
+
+register(IsIterable, 'be_an_iterable')
+
+
+class IsCallable(BaseMatcher):
+    """ Check if a value is callable """
+    def _matches(self, item):
+        return hasattr(item, '__call__')
+
+    def describe_to(self, desc):
+        desc.append_text('a callable value')
+
+register(IsCallable, 'be_callable', 'be_a_callable_value', 'can_be_called')
+
+
+class IsNone(BaseMatcher):
+    """ Check if a value is None """
+    def _matches(self, item):
+        return True if item is None else False
+
+    def describe_to(self, desc):
+        desc.append_text('a None')
+
+register(IsNone, 'be_none', 'be_a_none_value')
+
+
+class IsTrue(BaseMatcher):
+    """ Check if a value is True """
+    def _matches(self, item):
+        return item is True
+
+    def describe_to(self, desc):
+        desc.append_text('a True')
+
+
+class IsFalse(BaseMatcher):
+    """ Check if a value is False """
+    def _matches(self, item):
+        return item is False
+
+    def describe_to(self, desc):
+        desc.append_text('a False')
+
+
+class IsTruthy(BaseMatcher):
+    """ Check if a value is truthy """
+    def _matches(self, item):
+        return True if item else False
+
+    def describe_to(self, desc):
+        desc.append_text('a truthy value')
+
+
+class IsFalsy(BaseMatcher):
+    """ Check if a value is falsy """
+    def _matches(self, item):
+        return True if not item else False
+
+    def describe_to(self, desc):
+        desc.append_text('a falsy value')
+
+register(IsTrue, 'be_true')
+register(IsFalse, 'be_false')
+register(IsTruthy, 'be_a_truthy_value', 'be_truthy', 'be_ok')
+register(IsFalsy, 'be_a_falsy_value', 'be_falsy', 'be_ko')
+
+
+class IsEmpty(BaseMatcher):
+    """ Check if a value is empty """
+    def _matches(self, item):
+        try:
+            return not bool(len(item))
+        except:
+            return False
+
+    def describe_to(self, desc):
+        desc.append_text('an empty value')
+
+    def describe_mismatch(self, item, desc):
+        try:
+            l = len(item)
+            desc.append_text('has {0} elements'.format(l))
+        except:
+            desc.append_value(item)
+            desc.append_text(' does not have a length')
+
+register(IsEmpty, 'be_empty')
+
+
+class RaisesError(BaseMatcher):
+    """ Checks if calling the value raises an error """
+
+    def __init__(self, expected=None, message=None, regex=None):
+        self.expected = expected
+        self.message = message
+        self.regex = regex
+        self.thrown = None
+
+    def _matches(self, item):
+        # support passing a context manager result
+        if isinstance(item, ContextManagerResult):
+            # Python <2.7 may provide a non exception value
+            if isinstance(item.exc_value, Exception):
+                self.thrown = item.exc_value
+            elif item.exc_type is not None:
+                try:
+                    self.thrown = item.exc_type(*item.exc_value)
+                except TypeError:
+                    self.thrown = item.exc_type(item.exc_value)
+            else:
+                return False
+        else:
+            try:
+                # support passing arguments by feeding a tuple instead of a callable
+                if not callable(item) and getattr(item, '__getitem__', False):
+                    item[0](*item[1:])
+                else:
+                    item()
+                return False
+            except:
+                # This should capture any kind of raised value
+                import sys
+                self.thrown = sys.exc_info()[1]
+
+        # Fail if we have defined an expected error type
+        if self.expected and not isinstance(self.thrown, self.expected):
+            return False
+
+        # Apply message filters
+        if self.message:
+            return self.message == str(self.thrown)
+        elif self.regex:
+            return re.match(self.regex, str(self.thrown))
+
+        return True
+
+    def describe_to(self, desc):
+        if self.thrown and self.message:
+            desc.append_text('to raise an exception with message "%s"'
+                             % self.message)
+        elif self.thrown and self.regex:
+            desc.append_text('to raise an exception matching /%s/'
+                             % self.regex)
+        else:
+            desc.append_text('to raise an exception')
+            if self.expected:
+                try:
+                    exps = map(lambda x: x.__name__, self.expected)
+                except:
+                    exps = [self.expected.__name__]
+                desc.append_text(' of type <%s>' % '>, <'.join(exps))
+
+    def describe_mismatch(self, item, desc):
+        if self.thrown:
+            desc.append_text('was ')
+            desc.append_text('<%s>' % self.thrown.__class__.__name__)
+            if self.message or self.regex:
+                desc.append_text(' "%s"' % str(self.thrown))
+        else:
+            desc.append_text('no exception was raised')
+
+register(RaisesError,
+         'raise_an_error', 'raise_an_exception',
+         'raises_an_error', 'raises_an_exception', 'raises', 'raise',
+         'throw_an_error', 'throw_an_exception',
+         'throws_an_error', 'throws_an_exception', 'throws', 'throw')
+
+
+
+def fingerprint(value):
+    """ Digest of the serialized value, much cheaper than copying it when it's
+        large. Sets and dicts, whose equal values may be serialized in another
+        order, and values which cannot be pickled are hashed walking their
+        structure instead. Unordered containers nested in a list or an object
+        are still serialized, so reordering them may look like a change.
+    """
+    if isinstance(value, (dict, set, frozenset)):
+        return _fingerprint(value, set())
+    try:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return _fingerprint(value, set())
+    return hashlib.blake2b(data).digest()
+
+
+def _fingerprint(value, seen):
+    """ Structural hash of the containers and the attributes of objects """
+    key = id(value)
+    if key in seen:
+        return hash(('<cycle>', type(value)))
+    seen.add(key)
+    try:
+        if isinstance(value, dict):
+            items = frozenset((_fingerprint(k, seen), _fingerprint(v, seen))
+                              for k, v in value.items())
+            return hash((type(value), items))
+        if isinstance(value, (set, frozenset)):
+            return hash((type(value), frozenset(_fingerprint(v, seen) for v in value)))
+        if isinstance(value, (list, tuple)):
+            return hash((type(value), tuple(_fingerprint(v, seen) for v in value)))
+        if hasattr(value, '__dict__') and not isinstance(value, type):
+            return hash((type(value), _fingerprint(vars(value), seen)))
+        try:
+            return hash(value)
+        except TypeError:
+            return hash((type(value), repr(value)))
+    finally:
+        seen.discard(key)
+
+
+def _identity(value):
+    return value
+
+
+# Strategies to snapshot the value watched by the change matcher
+SNAPSHOTS = {
+    'deepcopy': deepcopy,
+    'shallow': copy,
+    'identity': _identity,
+    'fingerprint': fingerprint,
+}
+
+
+class Changes(BaseMatcher):
+    """ Checks if calling a value changes something. The watched value (or
+        the result of calling it) is snapshotted before the call using one of
+        the `snapshot` strategies:
+
+            deepcopy     a deep copy compared for equality (default)
+            shallow      a shallow copy compared for equality
+            identity     the value itself, it changes if it's another object
+            fingerprint  a structural hash, cheap for large values (sets and
+                         dicts nested in other values compare in order)
+            <callable>   its result for the value before and after the call
+    """
+
+    def __init__(self, watch, snapshot='deepcopy'):
+        self.watch = watch
+        if callable(snapshot):
+            self.snapshot = snapshot
+        elif snapshot in SNAPSHOTS:
+            self.snapshot = SNAPSHOTS[snapshot]
+        else:
+            raise ValueError('Unknown snapshot strategy {0!r}, use one of: {1}'.format(
+                snapshot, ', '.join(sorted(SNAPSHOTS))))
+
+        self.before = None
+        self.after = None
+        self.value = None
+        self.changed = False
+
+    def _watched(self):
+        return self.watch() if callable(self.watch) else self.watch
+
+    def _matches(self, item):
+        # support passing arguments by feeding a tuple instead of a callable
+        if not callable(item) and getattr(item, '__getitem__', False):
+            func = item[0]
+            params = item[1:]
+        else:
+            func = item
+            params = []
+
+        snapshot = self.snapshot
+        self.before = snapshot(self._watched())
+
+        func(*params)
+
+        # Copies are compared against the value itself
+        value = self._watched()
+        if snapshot in (deepcopy, copy, _identity):
+            self.after = value
+        else:
+            self.after = snapshot(value)
+        self.value = value
+
+        if snapshot is _identity:
+            self.changed = self.after is not self.before
+        else:
+            self.changed = not (self.after is self.before or self.after == self.before)
+
+        return self.changed
+
+    def describe_to(self, desc):
+        desc.append_text('change something')
+
+    def describe_mismatch(self, item, desc):
+        # Fingerprints are meaningless, describe the value itself
+        if self.snapshot is fingerprint:
+            if self.changed:
+                desc.append_text('did change to ').append_description_of(self.value)
+            else:
+                desc.append_text('it didn\'t change from ').append_description_of(self.value)
+            return
+
+        # To support its proper use when negated we need to check if
+        # the values actually changed or not
+        if self.changed:
+            desc.append_text('did change from ') \
+                .append_description_of(self.before) \
+                .append_text(' to ') \
+                .append_description_of(self.after)
+        else:
+            desc.append_text('it didn\'t change from ') \
+                .append_description_of(self.before)
+
+register(Changes,
+         'change', 'changes', 'modify', 'modifies')
+
+
+class Callback(BaseMatcher):
+    """ Checks against an user supplied callback. The callback
+        can should return True to indicate a successful match or
+        False to indicate an unsuccessful one.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def _matches(self, item):
+        self.error = None
+        try:
+            result = self.callback(item)
+            # Wait for asynchronous callbacks (ie: async functions)
+            if inspect.isawaitable(result):
+                from .aio import run
+                result = run(result)
+            return self._accepts(result)
+        except AssertionError:
+            # Just forward assertion failures
+            raise
+        except Exception as ex:
+            self.error = str(ex)
+            return False
+
+    @property
+    def asynchronous(self):
+        """ Checks if the callback is an async function """
+        return inspect.iscoroutinefunction(self.callback)
+
+    def _accepts(self, result):
+        # Returning an expectation assumes it's correct (no failure raised)
+        from .expectation import Expectation
+        return isinstance(result, Expectation) or bool(result)
+
+    def describe_to(self, desc):
+        desc.append_text('passses callback ')
+        if (isinstance(self.callback, type(lambda: None))
+                and self.callback.__name__ == '<lambda>'):
+            desc.append_text(self.callback.__name__)
+        else:
+            desc.append_text('{0}'.format(self.callback))
+
+    def describe_mismatch(self, item, desc):
+        if self.error:
+            desc.append_text('gave an exception "%s"' % self.error)
+        else:
+            desc.append_text('returned False')
+
+
+register(Callback,
+         'callback', 'pass', 'pass_callback')
+
+
+class MockCalled(BaseMatcher):
+    """ Support for checking if mocks where called from the Mock library
+    """
+    def _matches(self, item):
+        if not hasattr(item, 'called'):
+            raise Exception('Mock object does not have a <called> attribute')
+        return item.called
+
+    def describe_to(self, desc):
+        desc.append_text('called')
+
+    def describe_mismatch(self, item, desc):
+        if item.called:
+            desc.append_text('was called')
+        else:
+            desc.append_text('was not called')
+
+register(MockCalled, 'called', 'invoked')
+
+
+# Maximum number of compiled regular expressions kept by `compile_regex`
+REGEX_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(regex, flags=0):
+    """ Compiles a regular expression, patterns are shared among matchers """
+    return re.compile(regex, flags)
+
+
+def _regex_flags(flags):
+    """ Obtains the flags given as a string of letters (ie: 'im') """
+    if isinstance(flags, str):
+        value = 0
+        for ch in flags.upper():
+            value |= getattr(re, ch)
+        return value
+    return flags
+
+
+# Binary subjects, matched with the bytes version of the pattern
+bytes_types = (bytes, bytearray, memoryview)
+
+
+class RegexMatcher(BaseMatcher):
+    """ Checks against a regular expression. Bytes like subjects are matched
+        with the pattern encoded as UTF-8 and text with a bytes pattern decoded.
+    """
+
+    # Method of the compiled pattern performing the match
+    method = 'search'
+
+    def __init__(self, regex, flags=0):
+        if isinstance(regex, re.Pattern):
+            self.pattern = regex
+        else:
+            self.pattern = compile_regex(regex, _regex_flags(flags))
+        self.regex = self.pattern.pattern
+        self.flags = self.pattern.flags
+        self._other = None
+
+    def _other_pattern(self):
+        """ Pattern with the text/bytes counterpart of the regex """
+        if self._other is None:
+            flags = self.flags
+            if isinstance(self.regex, bytes):
+                regex = self.regex.decode('utf-8')
+            else:
+                regex = self.regex.encode('utf-8')
+                flags &= ~re.UNICODE
+            self._other = compile_regex(regex, flags)
+        return self._other
+
+    def _pattern_for(self, item):
+        if isinstance(item, str):
+            text = True
+        elif isinstance(item, bytes_types):
+            text = False
+        else:
+            return None
+
+        if text is isinstance(self.regex, bytes):
+            return self._other_pattern()
+        return self.pattern
+
+    def _matches(self, item):
+        pattern = self._pattern_for(item)
+        if pattern is None:
+            return False
+        return getattr(pattern, self.method)(item) is not None
+
+    def predicate(self):
+        """ Fast check for quantifiers over many items. It raises TypeError
+            for the items not supported, which are then checked with `matches`.
+        """
+        return getattr(self.pattern, self.method)
+
+    def describe_to(self, desc):
+        desc.append_text('matching ')
+        desc.append_text('/{0}/'.format(_regex_text(self.regex)))
+
+    def describe_mismatch(self, item, desc):
+        if self._pattern_for(item) is None:
+            desc.append_text('was not a string but ').append_description_of(item)
+        else:
+            super(RegexMatcher, self).describe_mismatch(item, desc)
+
+
+class AnchoredRegexMatcher(RegexMatcher):
+    """ Checks against a regular expression anchored at the start """
+
+    method = 'match'
+
+    def describe_to(self, desc):
+        desc.append_text('matching at the start ')
+        desc.append_text('/{0}/'.format(_regex_text(self.regex)))
+
+
+class FullRegexMatcher(RegexMatcher):
+    """ Checks against a regular expression which must match the whole value """
+
+    method = 'fullmatch'
+
+    def describe_to(self, desc):
+        desc.append_text('fully matching ')
+        desc.append_text('/{0}/'.format(_regex_text(self.regex)))
+
+
+def _regex_text(regex):
+    if isinstance(regex, bytes):
+        return regex.decode('utf-8', 'backslashreplace')
+    return regex
+
+register(RegexMatcher, 'match', 'match_regex', 'match_regexp', 'be_matched_by')
+register(AnchoredRegexMatcher, 'match_at_start', 'match_anchored', 'match_from_start')
+register(FullRegexMatcher, 'fullmatch', 'match_fully', 'fully_match', 'match_entirely')
+
+
+class IsObjectContainingEntries(IsDictContainingEntries):
+    """Matches if object has the properties from a given dict whose values and
+    keys satisfy a given matcher.
+
+    Examples::
+        :param inst: The instance or class.
+        :param mismatch_description: The description in case of failure.
+
+        have_properties({
+            'prop1': should.eq('value1'),
+            'prop2': should.eq('value2')
+        })
+    """
+    hidden = set(['should_not', 'should_all', 'should_any', 'should', 'should_none'])
+
+    def __init__(self, value_matchers=None, **kwargs):
+        base_dict = {}
+
+        if value_matchers is None:
+            value_matchers = kwargs
+
+        for key, value in value_matchers.items():
+            base_dict[key] = wrap_matcher(value)
+        super(IsObjectContainingEntries, self).__init__(base_dict)
+
+        # Plans to fetch the expected attributes per type of the value, not
+        # keeping the types alive (ie: created dynamically)
+        self._plans = weakref.WeakKeyDictionary()
+
+    def _plan(self, cls):
+        """ Decides how to fetch each expected attribute for instances of a
+            type, as a tuple of (key, getter, matcher). Plain attributes are
+            read from the instance dict, avoiding the attribute lookup, unless
+            the type defines a data descriptor for them or customizes the
+            lookup. The getter is None for the attributes ignored.
+        """
+        plan = self._plans.get(cls)
+        if plan is not None:
+            return plan
+
+        custom = (cls.__getattribute__ is not object.__getattribute__
+                  or issubclass(cls, type))
+        plan = []
+        for key, matcher in self.value_matchers:
+            if key.startswith('__') or key in self.hidden:
+                getter = None
+            elif custom or _is_data_descriptor(cls, key):
+                getter = attrgetter(key)
+            else:
+                getter = _instance_getter(key)
+            plan.append((key, getter, matcher))
+
+        plan = self._plans[cls] = tuple(plan)
+        return plan
+
+    def __getstate__(self):
+        # Plans are rebuilt when needed, they may hold closures
+        state = dict(self.__dict__)
+        del state['_plans']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._plans = weakref.WeakKeyDictionary()
+
+    def _attributes(self, inst):
+        """ All the attributes of the value, only used to describe a missing one """
+        return dict(
+            (key, getattr(inst, key))
+            for key in dir(inst)
+            if not key.startswith('__')
+            and key not in IsObjectContainingEntries.hidden
+        )
+
+    def matches(self, inst, mismatch_description=None):
+        # Only the expected attributes are fetched, so other properties of
+        # the value are never triggered
+        for key, getter, matcher in self._plan(type(inst)):
+            try:
+                if getter is None:
+                    raise AttributeError(key)
+                value = getter(inst)
+            except AttributeError:
+                if mismatch_description:
+                    # Described like a missing key of the dict of attributes
+                    try:
+                        attributes = self._attributes(inst)
+                    except Exception as ex:
+                        mismatch_description.append_text(
+                            'unable to extract attributes from value: {0}'.format(ex))
+                        return False
+                    mismatch_description.append_text('no ') \
+                        .append_description_of(key) \
+                        .append_text(' key in ') \
+                        .append_description_of(attributes)
+                return False
+            except Exception as ex:
+                if mismatch_description:
+                    mismatch_description.append_text(
+                        'unable to extract attribute {0!r} from value: {1}'.format(key, ex))
+                return False
+
+            if not matcher.matches(value):
+                if mismatch_description:
+                    mismatch_description.append_text('value for ') \
+                        .append_description_of(key) \
+                        .append_text(' ')
+                    matcher.describe_mismatch(value, mismatch_description)
+                return False
+
+        return True
+
+    def describe_to(self, desc):
+        desc.append_text('a class as ')
+        super(IsObjectContainingEntries, self).describe_to(desc)
+
+
+def _is_data_descriptor(cls, key):
+    """ Checks if the type defines the key as a data descriptor (ie: property
+        or slot), which takes precedence over the instance dict.
+    """
+    for klass in cls.__mro__:
+        if key in klass.__dict__:
+            attr = type(klass.__dict__[key])
+            return hasattr(attr, '__set__') or hasattr(attr, '__delete__')
+    return False
+
+
+def _instance_getter(key):
+    """ Reads the attribute from the instance dict falling back to a regular
+        lookup for class attributes and dynamic ones.
+    """
+    def getter(inst):
+        try:
+            return inst.__dict__[key]
+        except (AttributeError, KeyError):
+            return getattr(inst, key)
+    return getter
+
+
+register(IsObjectContainingEntries,
+         'have_the_properties', 'contain_the_properties', 'have_the_attributes', 'contain_the_attributes',
+         'have_props', 'contain_props', 'have_attrs', 'contain_attrs')
+
+
+# Types whose values compare equal consistently with their hash
+LITERAL_TYPES = (int, float, complex, bool, bytes, str, type(None))
+
+
+def _literals(items):
+    """ Obtains the expected items if all of them are plain literals (or
+        tuples of them), otherwise None.
+    """
+    for item in items:
+        if type(item) is tuple:
+            if _literals(item) is None:
+                return None
+        elif type(item) not in LITERAL_TYPES or item != item:  # NaN
+            return None
+    return list(items)
+
+
+class LiteralsFastPath(object):
+    """ Mixin for the collection matchers checking the items with a hash or
+        a plain comparison when all the expected items are literals. Only
+        matches are decided that way, a mismatch (or a value whose items are
+        not hashable) goes through the standard matcher, so the outcome and
+        the mismatch descriptions are the same. Only collections are checked
+        this way since iterators cannot be consumed twice.
+    """
+
+    literals = None
+
+    def _matches_literals(self, items):
+        """ Checks the items against the literals, a false result (None by
+            default) leaves the decision to the standard matcher.
+        """
+        return None
+
+    def matches(self, item, mismatch_description=None):
+        if self.literals is not None and isinstance(item, (Sequence, Set)):
+            try:
+                if self._matches_literals(item):
+                    return True
+            except TypeError:
+                pass
+        return super(LiteralsFastPath, self).matches(item, mismatch_description)
+
+
+class IsSequenceContainingInAnyOrderLiterals(LiteralsFastPath, IsSequenceContainingInAnyOrder):
+
+    def _matches_literals(self, items):
+        return len(items) == len(self.literals) and Counter(items) == self.counts
+
+
+class IsSequenceContainingInOrderLiterals(LiteralsFastPath, IsSequenceContainingInOrder):
+
+    def _matches_literals(self, items):
+        return len(items) == len(self.literals) and list(items) == self.literals
+
+
+class IsSequenceContainingEveryLiterals(LiteralsFastPath, IsSequenceContainingEvery):
+
+    def _matches_literals(self, items):
+        return self.unique.issubset(items if isinstance(items, Set) else set(items))
+
+
+class IsSequenceOnlyContainingLiterals(LiteralsFastPath, IsSequenceOnlyContaining):
+
+    def _matches_literals(self, items):
+        return len(items) > 0 and self.unique.issuperset(items)
+
+
+def contains_inanyorder(*items):
+    """Matches if sequences's elements, in any order, satisfy a given list of
+    matchers. Values which are not matchers are compared for equality.
+    """
+    matcher = IsSequenceContainingInAnyOrderLiterals([wrap_matcher(i) for i in items])
+    matcher.literals = _literals(items)
+    if matcher.literals is not None:
+        matcher.counts = Counter(matcher.literals)
+    return matcher
+
+
+def contains_exactly(*items):
+    """Matches if sequence's elements satisfy a given list of matchers, in
+    order. Values which are not matchers are compared for equality.
+    """
+    matcher = IsSequenceContainingInOrderLiterals([wrap_matcher(i) for i in items])
+    matcher.literals = _literals(items)
+    return matcher
+
+
+def has_items(*items):
+    """Matches if all of the given matchers are satisfied by any elements of
+    the sequence. Values which are not matchers are compared for equality.
+    """
+    matcher = IsSequenceContainingEveryLiterals(*[wrap_matcher(i) for i in items])
+    matcher.literals = _literals(items)
+    if matcher.literals is not None:
+        matcher.unique = frozenset(matcher.literals)
+    return matcher
+
+
+def only_contains(*items):
+    """Matches if each element of sequence satisfies any of the given
+    matchers. Values which are not matchers are compared for equality.
+    """
+    matcher = IsSequenceOnlyContainingLiterals(hc.any_of(*[wrap_matcher(i) for i in items]))
+    matcher.literals = _literals(items)
+    if matcher.literals is not None:
+        matcher.unique = frozenset(matcher.literals)
+    return matcher
+
+
+register(has_items,
+         'have_the_items', 'contain_the_items')
+register(contains_inanyorder,
+         'have_in_any_order', 'contain_in_any_order')
+register(contains_exactly,
+         'have', 'contain')
+register(only_contains,
+         'have_only', 'contain_only')
+
+
+class IsSequenceContainingEveryInOrderSparse(IsSequenceContainingEvery):
+    """
+    Matches if a list contains every given element in the same order but with
+    optional interleaved items.
+    No optional elements matching the required ones are allowed.
+    Mismatch description prioritizes missing items over wrong order.
+    e.g. [1, 3, 4] IsSequenceContainingEveryInOrder [1, 4]
+                   but NOT IsSequenceContainingEveryInOrder [4, 1]
+                   and NOT IsSequenceContainingEveryInOrder [1, 4, 4]
+    """
+
+    def __init__(self, *element_matchers):
+        self.matchers = [wrap_matcher(e) for e in element_matchers]
+        # Only used to describe the expectation and its mismatches
+        self.matcher_all = hc.all_of(*[hc.has_item(m) for m in self.matchers])
+        self.matcher_order = hc.contains_exactly(*self.matchers)
+
+    def matches(self, item, mismatch_description=None):
+        # Iterators are consumed by the check so keep their items to describe them
+        if mismatch_description is not None:
+            try:
+                if iter(item) is item:
+                    item = list(item)
+            except TypeError:
+                pass
+
+        if self._matches(item):
+            return True
+        if mismatch_description is not None:
+            self.describe_mismatch(item, mismatch_description)
+        return False
+
+    def _matches(self, sequence):
+        """ Checks the items in a single pass. Items matching any of the
+            matchers are candidates, which must match them in order. Once the
+            order fails only the matchers not found yet are checked, stopping
+            as soon as all of them are, since missing items take priority.
+        """
+        try:
+            iterator = iter(sequence)
+        except TypeError:
+            return False
+
+        matchers = self.matchers
+        total = len(matchers)
+        pending = set(range(total))
+        position = 0
+        failed = False
+        for item in iterator:
+            if not failed:
+                if position < total and matchers[position].matches(item):
+                    pending.discard(position)
+                    # It may be the only item for some later matcher too
+                    for index in [i for i in pending if matchers[i].matches(item)]:
+                        pending.discard(index)
+                    position += 1
+                    continue
+
+                for index in range(total):
+                    if index != position and matchers[index].matches(item):
+                        pending.discard(index)
+                        failed = True
+            else:
+                pending.difference_update([i for i in pending if matchers[i].matches(item)])
+
+            if failed and not pending:
+                break
+
+        return not pending and not failed and position == total
+
+    def describe_mismatch(self, item, mismatch_description):
+        """ Describes the mismatch checking all the items, since the messages
+            report every candidate and not just the ones until the check stops.
+        """
+        try:
+            items = list(item)
+        except TypeError:
+            items = None
+
+        if items is None or not self.matcher_all.matches(items):
+            mismatch_description.append_text(' instead of a ')
+            self.matcher_all.describe_mismatch(item, mismatch_description)
+            return
+
+        candidates = [i for i in items if any(m.matches(i) for m in self.matchers)]
+        self.matcher_order.describe_mismatch(candidates, mismatch_description)
+        mismatch_description.append_text(
+            ' from candidate list elements: '
+        ).append_description_of(candidates).append_text(
+            ' that satisfied those conditions from '
+        ).append_description_of(item)
+
+    def describe_to(self, description):
+        self.matcher_all.describe_to(description)
+        description.append_text(' in this specific order')
+
+
+register(IsSequenceContainingEveryInOrderSparse,
+         'contain_sparse', 'have_sparse', 'contain_sparse_in_order',
+         'contain_in_order_sparse', 'have_every_in_order_sparse',
+         'have_in_order_sparse', 'contain_every_in_order_sparse')
+
+
+class IsDeepEqual(BaseMatcher):
+    """ Compares nested structures reporting where they differ as JSONPath
+        like locations (ie: $.items[42].price). The `ignore` patterns skip
+        some paths while `tolerance` is the maximum difference allowed for
+        numbers, either for all of them or as a dict of patterns to values.
+        Up to `max_differences` are reported.
+    """
+
+    def __init__(self, expected, ignore=(), tolerance=None, max_differences=1):
+        self.expected = expected
+        self.rules = deep.Rules(ignore, tolerance)
+        self.max_differences = max_differences
+
+    def _differences(self, item):
+        # A plain comparison is fast and the rules can only relax it
+        try:
+            if self.expected == item:
+                return []
+        except Exception:  # Cyclic values or element-wise comparisons
+            pass
+
+        return deep.compare(self.expected, item, self.rules, self.max_differences)
+
+    def _matches(self, item):
+        return not self._differences(item)
+
+    def matches(self, item, mismatch_description=None):
+        # Differences are described in the same call, since checkers sharing
+        # this matcher may be used from several threads
+        differences = self._differences(item)
+        if differences and mismatch_description is not None:
+            self._describe(differences, mismatch_description)
+        return not differences
+
+    def describe_to(self, description):
+        description.append_text('a structure deeply equal to ') \
+            .append_description_of(self.expected)
+
+    def describe_mismatch(self, item, mismatch_description):
+        differences = self._differences(item)
+        if not differences:
+            super(IsDeepEqual, self).describe_mismatch(item, mismatch_description)
+        else:
+            self._describe(differences, mismatch_description)
+
+    def _describe(self, differences, mismatch_description):
+        for index, (path, kind, expected, actual) in enumerate(differences):
+            if index:
+                mismatch_description.append_text('; ')
+            mismatch_description.append_text(deep.render(path))
+            if kind == 'missing':
+                mismatch_description.append_text(' was missing')
+            elif kind == 'unexpected':
+                mismatch_description.append_text(' was not expected: ') \
+                    .append_description_of(actual)
+            elif kind == 'length':
+                mismatch_description.append_text(
+                    ' had {0} items instead of {1}'.format(actual, expected))
+            else:
+                mismatch_description.append_text(' was ') \
+                    .append_description_of(actual) \
+                    .append_text(' instead of ') \
+                    .append_description_of(expected)
+
+
+register(IsDeepEqual,
+         'deep_equal', 'deeply_equal', 'be_deep_equal_to', 'be_deeply_equal_to',
+         'equal_deeply')
@@ -0,0 +1,316 @@
+"""
+Structural comparison of nested values (ie: decoded JSON payloads) reporting
+the location of the differences as JSONPath like expressions:
+
+    $.items[42].price
+
+Both structures are walked with an explicit stack, so there is no recursion
+limit, and shared or cyclic containers are compared just once. Rules can
+ignore some paths or compare the numbers on them with a tolerance, their
+patterns accept `*` for any key or index and `..` (or `**`) for any number
+of them:
+
+    $.items[*].updated_at
+    $..id
+"""
+import re
+from numbers import Real
+from itertools import islice
+from collections.abc import Mapping
+
+from .diff import common_prefix
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Placeholder for the value of a key or index missing on one of the sides
+MISSING = object()
+
+# Wildcards for a single segment and for any number of them
+ANY = '*'
+ANY_DEPTH = '**'
+
+# Segments of a path pattern after the initial $
+_SEGMENT = re.compile(r'''
+    \.(\*\*|\*|[^.\[]+)                                           # .name
+  | \.?\[\s*(\*\*|\*|-?\d+|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")\s*\]    # [index]
+''', re.VERBOSE)
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def parse(pattern):
+    """ Converts a path pattern into a tuple of segments """
+    text = pattern.strip()
+    if text.startswith('$'):
+        text = text[1:]
+    elif text[:1] not in ('.', '['):
+        text = '.' + text
+
+    segments = []
+    position = 0
+    while position < len(text):
+        # `$..name` is the same as `$.**.name`
+        if text.startswith('..', position):
+            segments.append(ANY_DEPTH)
+            position += 2 if position + 2 == len(text) else 1
+            continue
+
+        match = _SEGMENT.match(text, position)
+        if not match:
+            raise ValueError('Invalid path pattern {0!r} at {1!r}'.format(
+                pattern, text[position:]))
+        name, index = match.groups()
+        if name is not None:
+            segments.append(name)
+        elif index in (ANY, ANY_DEPTH):
+            segments.append(index)
+        elif index[0] in '\'"':
+            segments.append(re.sub(r'\\(.)', r'\1', index[1:-1]))
+        else:
+            segments.append(int(index))
+        position = match.end()
+    return tuple(segments)
+
+
+def render(path):
+    """ Renders a path, kept as (parent, segment) cons cells, as a string """
+    segments = []
+    while path is not None:
+        path, segment = path
+        segments.append(segment)
+
+    parts = ['$']
+    for segment in reversed(segments):
+        if isinstance(segment, str) and _IDENTIFIER.match(segment):
+            parts.append('.' + segment)
+        else:
+            parts.append('[{0!r}]'.format(segment))
+    return ''.join(parts)
+
+
+class Rules(object):
+    """ Ignore and tolerance rules matched while walking the structures. The
+        matching state of a path is a set of (rule, position) pairs, advanced
+        with each segment, so checking a path does not depend on its depth.
+    """
+
+    def __init__(self, ignore=(), tolerance=None):
+        self.default = None
+        self.rules = []
+        if isinstance(ignore, str):
+            ignore = (ignore,)
+        for pattern in ignore or ():
+            self.rules.append((parse(pattern), None))
+        if isinstance(tolerance, Mapping):
+            for pattern, value in tolerance.items():
+                self.rules.append((parse(pattern), value))
+        else:
+            self.default = tolerance
+        self._transitions = {}
+        self._resolved = {}
+
+    def start(self):
+        """ Matching state for the root of the structure """
+        return self._closure((rule, 0) for rule in range(len(self.rules)))
+
+    def _closure(self, states):
+        # Any depth wildcards can also match no segment at all
+        result = set()
+        pending = list(states)
+        while pending:
+            rule, position = pending.pop()
+            if (rule, position) in result:
+                continue
+            result.add((rule, position))
+            segments = self.rules[rule][0]
+            if position < len(segments) and segments[position] == ANY_DEPTH:
+                pending.append((rule, position + 1))
+        return frozenset(result)
+
+    def advance(self, states, segment):
+        """ Matching state for a child with the given key or index. The
+            transitions are cached for each state, keyed by the literal
+            segments in its patterns, since any other segment can only
+            match the wildcards.
+        """
+        transitions = self._transitions.get(states)
+        if transitions is None:
+            literals = set()
+            for rule, position in states:
+                segments = self.rules[rule][0]
+                if position < len(segments) and segments[position] not in (ANY, ANY_DEPTH):
+                    literals.add(segments[position])
+            transitions = self._transitions[states] = (literals, {})
+
+        literals, cache = transitions
+        if segment in literals:
+            key = segment
+        elif isinstance(segment, int) and str(segment) in literals:
+            key = str(segment)
+        else:
+            key = ANY
+        if key not in cache:
+            cache[key] = self._advance(states, key)
+        return cache[key]
+
+    def _advance(self, states, segment):
+        advanced = []
+        for rule, position in states:
+            segments = self.rules[rule][0]
+            if position == len(segments):
+                continue
+            expected = segments[position]
+            if expected == ANY_DEPTH:
+                advanced.append((rule, position))
+            elif expected == ANY or expected == segment:
+                advanced.append((rule, position + 1))
+        return self._closure(advanced) if advanced else frozenset()
+
+    def resolve(self, states):
+        """ Obtains if a path is ignored and the tolerance for its numbers """
+        resolved = self._resolved.get(states)
+        if resolved is None:
+            resolved = self._resolved[states] = self._resolve(states)
+        return resolved
+
+    def _resolve(self, states):
+        tolerance = self.default
+        for rule, position in sorted(states):
+            segments, value = self.rules[rule]
+            if position == len(segments):
+                if value is None:
+                    return True, None
+                tolerance = value
+        return False, tolerance
+
+
+def compare(expected, actual, rules=None, limit=1):
+    """ Compares two structures returning up to `limit` differences, as
+        (path, kind, expected, actual) tuples in the order they are found.
+        Kinds are 'value', 'missing', 'unexpected' and 'length'.
+    """
+    if rules is None:
+        rules = Rules()
+    checked = bool(rules.rules) or rules.default is not None
+    differences = []
+    seen = set()
+    native = True
+    stack = [(expected, actual, None, rules.start() if checked else None)]
+    while stack:
+        expected, actual, path, states = stack.pop()
+        if expected is actual:
+            continue
+
+        tolerance = rules.default
+        if states:
+            ignored, tolerance = rules.resolve(states)
+            if ignored:
+                continue
+
+        cls = type(expected)
+        if actual is MISSING:
+            kind = 'missing'
+        elif expected is MISSING:
+            kind = 'unexpected'
+        elif cls is _Length:
+            # Lengths are always compared exactly, tolerances are for values
+            if expected == actual:
+                continue
+            kind = 'length'
+        elif cls in SCALAR_TYPES or type(actual) in SCALAR_TYPES:
+            if _equal(expected, actual, tolerance):
+                continue
+            kind = 'value'
+        else:
+            actual_cls = type(actual)
+            if (cls is list and actual_cls is list) or (cls is tuple and actual_cls is tuple) \
+                    or (isinstance(expected, list) and isinstance(actual, list)) \
+                    or (isinstance(expected, tuple) and isinstance(actual, tuple)):
+                children = len(actual)
+            elif isinstance(expected, Mapping) and isinstance(actual, Mapping):
+                children = None
+            elif _equal(expected, actual, tolerance):
+                continue
+            else:
+                differences.append((path, 'value', expected, actual))
+                if len(differences) >= limit:
+                    break
+                continue
+
+            # Containers without rules applying to them are compared natively
+            # first, only walking them to find where they differ, and the
+            # items of sequences from the first different one.
+            first = 0
+            if native and not states and tolerance is None:
+                try:
+                    if expected == actual:
+                        continue
+                    if children is not None:
+                        first = common_prefix(expected, actual)
+                except RecursionError:
+                    native = False
+                except Exception:
+                    pass
+
+            pair = (id(expected), id(actual), states)
+            if pair in seen:
+                continue
+            seen.add(pair)
+
+            # Children are pushed in reverse so they are compared in order
+            if children is None:
+                children = [(key, value, actual.get(key, MISSING))
+                            for key, value in expected.items()]
+                children.extend((key, MISSING, value) for key, value in actual.items()
+                                if key not in expected)
+            else:
+                if len(expected) != children:
+                    # Reported once the common items are compared
+                    stack.append((_Length(len(expected)), children, path, states))
+                children = zip(range(first, min(len(expected), children)),
+                               islice(expected, first, None), islice(actual, first, None))
+            _push(stack, rules, list(children), path, states)
+            continue
+
+        differences.append((path, kind, int(expected) if cls is _Length else expected, actual))
+        if len(differences) >= limit:
+            break
+
+    return differences
+
+
+class _Length(int):
+    """ Expected length of a sequence whose length is different """
+
+
+# Values which are compared directly, without walking them
+SCALAR_TYPES = frozenset((int, float, complex, bool, str, bytes, type(None), _Length))
+
+
+def _push(stack, rules, children, path, states):
+    if states:
+        advance = rules.advance
+        stack.extend([(expected, actual, (path, key), advance(states, key))
+                      for key, expected, actual in reversed(children)])
+    else:
+        stack.extend([(expected, actual, (path, key), states)
+                      for key, expected, actual in reversed(children)])
+
+
+def _equal(expected, actual, tolerance):
+    if tolerance is not None and isinstance(expected, Real) and isinstance(actual, Real) \
+            and not isinstance(expected, bool) and not isinstance(actual, bool):
+        return abs(expected - actual) <= tolerance
+
+    try:
+        result = expected == actual
+        try:
+            return bool(result)
+        except ValueError:
+            # Element-wise comparisons (ie: NumPy arrays)
+            return bool(result.all())
+    except Exception:
+        return False
@@ -0,0 +1,172 @@
+"""
+Bounded descriptions for the mismatch messages. Describing a huge subject in
+full is slow and floods the logs, so values are abbreviated with reprlib to
+a budget of items per container and nesting depth, strings and bytes to the
+budget of characters without rendering them whole, and a description stops
+growing once it reaches its budget of characters. Abbreviations only depend
+on the values, so the messages are deterministic.
+
+    from pyshould import description
+    description.configure(max_chars=2000, max_items=10)
+
+    with description.limits(max_failures=20):
+        values | should_all.be_int
+"""
+import reprlib
+import contextvars
+from contextlib import contextmanager
+
+from hamcrest.core.string_description import StringDescription
+from hamcrest.core.helpers.hasmethod import hasmethod
+from hamcrest.core.helpers.ismock import ismock
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Appended to a description exceeding its budget of characters
+TRUNCATED = '... [truncated]'
+
+# Values abbreviated by reprlib, other ones are described with str()
+CONTAINERS = (list, tuple, dict, set, frozenset, bytes, bytearray)
+
+
+class Abbreviator(reprlib.Repr):
+    """ Abbreviates bytes like reprlib does with strings, only rendering the
+        characters shown.
+    """
+
+    def repr_bytes(self, x, level):
+        s = repr(x[:self.maxstring])
+        if len(s) > self.maxstring:
+            i = max(0, (self.maxstring - 3) // 2)
+            j = max(0, self.maxstring - 3 - i)
+            s = repr(x[:i] + x[len(x) - j:])
+            s = s[:i] + '...' + s[len(s) - j:]
+        return s
+
+    repr_bytearray = repr_bytes
+
+
+class Budget(object):
+    """ Limits for the descriptions:
+
+            max_chars       characters of a whole description
+            max_items       items shown for each container
+            max_depth       nesting levels of containers shown
+            max_failures    items reported by a failed quantifier
+    """
+
+    __slots__ = ('max_chars', 'max_items', 'max_depth', 'max_failures', '_repr')
+
+    SETTINGS = ('max_chars', 'max_items', 'max_depth', 'max_failures')
+
+    def __init__(self, max_chars=4000, max_items=20, max_depth=4, max_failures=5):
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_failures = max_failures
+        self._repr = None
+
+    def settings(self):
+        return dict((name, getattr(self, name)) for name in self.SETTINGS)
+
+    @property
+    def repr(self):
+        """ Abbreviating repr for the budget, built the first time needed """
+        if self._repr is None:
+            abbreviator = Abbreviator()
+            abbreviator.maxlevel = self.max_depth
+            for name in ('maxlist', 'maxtuple', 'maxdict', 'maxset', 'maxfrozenset',
+                         'maxdeque', 'maxarray'):
+                setattr(abbreviator, name, self.max_items)
+            abbreviator.maxstring = abbreviator.maxother = abbreviator.maxlong = self.max_chars
+            self._repr = abbreviator
+        return self._repr
+
+
+# Default budget, it's replaced instead of mutated when configured
+budget = Budget()
+
+# Budget set for the current thread or task by `limits`, if any
+_limits = contextvars.ContextVar('pyshould_budget', default=None)
+
+
+def current():
+    """ Obtains the budget in effect for the current thread or task """
+    return _limits.get() or budget
+
+
+def configure(**settings):
+    """ Changes some settings of the default budget, returning the previous one """
+    global budget
+    previous = budget
+    budget = _update(previous, settings)
+    return previous
+
+
+def _update(previous, settings):
+    values = previous.settings()
+    for name in settings:
+        if name not in values:
+            raise TypeError('Unknown description budget setting {0!r}'.format(name))
+    values.update(settings)
+    return Budget(**values)
+
+
+@contextmanager
+def limits(**settings):
+    """ Changes some settings of the budget while running the block, only for
+        the current thread or task so concurrent ones are not affected.
+    """
+    updated = _update(current(), settings)
+    token = _limits.set(updated)
+    try:
+        yield updated
+    finally:
+        _limits.reset(token)
+
+
+class BoundedDescription(StringDescription):
+    """ String description honoring a budget, the current one by default """
+
+    def __init__(self, limits=None):
+        self.out = ''
+        self.budget = limits if limits is not None else current()
+        self.truncated = False
+
+    def append(self, string):
+        if self.truncated:
+            return
+
+        string = str(string)
+        room = self.budget.max_chars - len(self.out)
+        if len(string) > room:
+            self.out += string[:max(room, 0)] + TRUNCATED
+            self.truncated = True
+        else:
+            self.out += string
+
+    def append_description_of(self, value):
+        if self.truncated:
+            return self
+
+        # Same as hamcrest but abbreviating the values
+        if not ismock(value) and hasmethod(value, 'describe_to'):
+            value.describe_to(self)
+        elif isinstance(value, str):
+            self.append(self.budget.repr.repr(value))
+        else:
+            if isinstance(value, CONTAINERS):
+                description = self.budget.repr.repr(value)
+            else:
+                description = str(value)
+
+            if description[:1] == '<' and description[-1:] == '>':
+                self.append(description)
+            else:
+                self.append('<')
+                self.append(description)
+                self.append('>')
+        return self
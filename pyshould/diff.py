@@ -0,0 +1,265 @@
+"""
+Differences between long strings and sequences for the mismatch messages of
+the equality matchers. The common prefix and suffix are skipped comparing
+whole chunks at once, then only the window in between is diffed with the
+Myers algorithm, which gives up after a number of edits. So the cost depends
+on the size of the differences and not on the size of the values.
+"""
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Smallest chunk of items compared when skipping the common prefix and suffix
+CHUNK = 1024
+
+# Edits searched before giving up on describing the differences
+MAX_EDITS = 64
+
+# Items of each value diffed after the common prefix
+WINDOW = 1024
+
+# Values shorter than this are described without a diff
+MIN_SIZE = 32
+
+# Characters of unchanged text shown around the differences
+CONTEXT = 20
+
+
+def common_prefix(a, b):
+    """ Length of the common prefix of two sequences """
+    limit = min(len(a), len(b))
+    start = 0
+    step = CHUNK
+    # The chunks grow while they are equal and shrink to find the first
+    # different one, so long prefixes are compared in a few slices.
+    while start < limit:
+        end = min(start + step, limit)
+        if a[start:end] == b[start:end]:
+            start = end
+            step *= 2
+        elif end - start > CHUNK:
+            step = (end - start) // 2
+        else:
+            break
+    else:
+        return limit
+
+    # Look for the first different item within the chunk
+    while start < limit and a[start] == b[start]:
+        start += 1
+    return start
+
+
+def common_suffix(a, b, prefix=0):
+    """ Length of the common suffix of two sequences, without overlapping a
+        common prefix of the given length.
+    """
+    len_a, len_b = len(a), len(b)
+    limit = min(len_a, len_b) - prefix
+    size = 0
+    step = CHUNK
+    while size < limit:
+        step = min(step, limit - size)
+        if a[len_a - size - step:len_a - size] == b[len_b - size - step:len_b - size]:
+            size += step
+            step *= 2
+        elif step > CHUNK:
+            step //= 2
+        else:
+            break
+    else:
+        return limit
+
+    while size < limit and a[len_a - size - 1] == b[len_b - size - 1]:
+        size += 1
+    return size
+
+
+def myers(a, b, max_edits=MAX_EDITS):
+    """ Obtains the shortest edit script transforming `a` into `b`, as a list
+        of (tag, i, j) tuples where tag is '-' to delete a[i] or '+' to insert
+        b[j] before a[i]. Returns None if it needs more than `max_edits`.
+    """
+    len_a, len_b = len(a), len(b)
+    offset = max_edits + 1
+    furthest = [0] * (2 * offset + 1)
+    trace = []
+    for edits in range(max_edits + 1):
+        trace.append(list(furthest))
+        for k in range(-edits, edits + 1, 2):
+            if k == -edits or (k != edits and furthest[offset + k - 1] < furthest[offset + k + 1]):
+                x = furthest[offset + k + 1]
+            else:
+                x = furthest[offset + k - 1] + 1
+            y = x - k
+            while x < len_a and y < len_b and a[x] == b[y]:
+                x += 1
+                y += 1
+            furthest[offset + k] = x
+            if x >= len_a and y >= len_b:
+                return _backtrack(trace, offset, len_a, len_b)
+    return None
+
+
+def _backtrack(trace, offset, x, y):
+    """ Walks the furthest points reached for each number of edits back from
+        the end to obtain the edits taken.
+    """
+    script = []
+    for edits in range(len(trace) - 1, 0, -1):
+        furthest = trace[edits]
+        k = x - y
+        if k == -edits or (k != edits and furthest[offset + k - 1] < furthest[offset + k + 1]):
+            k += 1
+            x = furthest[offset + k]
+            y = x - k
+            script.append(('+', x, y))
+        else:
+            k -= 1
+            x = furthest[offset + k]
+            y = x - k
+            script.append(('-', x, y))
+    script.reverse()
+    return script
+
+
+def opcodes(script):
+    """ Groups the consecutive edits of a script into (i1, i2, j1, j2) hunks
+        replacing a[i1:i2] with b[j1:j2].
+    """
+    hunks = []
+    for tag, i, j in script:
+        if hunks:
+            i1, i2, j1, j2 = hunks[-1]
+            if tag == '-' and i == i2 and j == j2:
+                hunks[-1] = (i1, i2 + 1, j1, j2)
+                continue
+            if tag == '+' and i == i2 and j == j2:
+                hunks[-1] = (i1, i2, j1, j2 + 1)
+                continue
+        if tag == '-':
+            hunks.append((i, i + 1, j, j))
+        else:
+            hunks.append((i, i, j, j + 1))
+    return hunks
+
+
+class Diff(object):
+    """ Differences between two sequences. `start` is the length of their
+        common prefix and `hunks` the (i1, i2, j1, j2) ranges replaced after
+        it, or None when there are more than `max_edits`. When the window
+        after the prefix is clipped only the hunks inside it are kept.
+    """
+
+    def __init__(self, expected, actual, max_edits=MAX_EDITS, window=WINDOW):
+        self.expected = expected
+        self.actual = actual
+        self.start = start = common_prefix(expected, actual)
+        suffix = common_suffix(expected, actual, start)
+        self.end_expected = len(expected) - suffix
+        self.end_actual = len(actual) - suffix
+        self.clipped = max(self.end_expected, self.end_actual) - start > window
+
+        self.hunks = None
+        script = myers(expected[start:min(self.end_expected, start + window)],
+                       actual[start:min(self.end_actual, start + window)],
+                       max_edits)
+        if script is None:
+            return
+
+        self.hunks = [(i1 + start, i2 + start, j1 + start, j2 + start)
+                      for i1, i2, j1, j2 in opcodes(script)]
+        if self.clipped:
+            # Edits near the end of the window may just come from clipping
+            # the values at different items.
+            limit = start + window - max_edits
+            self.hunks = [h for h in self.hunks if h[1] < limit and h[3] < limit]
+
+
+def describe(expected, actual, desc):
+    """ Appends the differences of the values to a mismatch description """
+    result = Diff(expected, actual)
+    desc.append_text('differs at index %d' % result.start)
+    if isinstance(expected, str):
+        line = expected.count('\n', 0, result.start) + 1
+        column = result.start - expected.rfind('\n', 0, result.start)
+        desc.append_text(' (line %d, column %d)' % (line, column))
+
+    if result.hunks is None:
+        desc.append_text(', more than %d edits' % MAX_EDITS)
+    elif result.clipped:
+        desc.append_text(', showing the edits in the next %d items' % WINDOW)
+
+    if isinstance(expected, (str, bytes)):
+        _describe_text(result, desc)
+    else:
+        _describe_items(result, desc)
+
+
+def _text(value):
+    """ Escapes a fragment of text like repr does but without quotes """
+    text = repr(value)
+    return text[text.index(text[-1]) + 1:-1]
+
+
+def _describe_text(result, desc):
+    """ Shows the text around the differences marking the removed [-...-]
+        and inserted {+...+} fragments.
+    """
+    expected, actual = result.expected, result.actual
+    hunks = result.hunks
+    if hunks is None:
+        # Just show where both values start to differ
+        hunks = [(result.start, min(result.end_expected, result.start + CONTEXT),
+                  result.start, min(result.end_actual, result.start + CONTEXT))]
+
+    position = max(0, result.start - CONTEXT)
+    parts = ['...' if position else '']
+    for i1, i2, j1, j2 in hunks:
+        if i1 - position > 2 * CONTEXT:
+            parts.append(_text(expected[position:position + CONTEXT]) + '...'
+                         + _text(expected[i1 - CONTEXT:i1]))
+        else:
+            parts.append(_text(expected[position:i1]))
+        if i2 > i1:
+            parts.append('[-%s-]' % _text(expected[i1:i2]))
+        if j2 > j1:
+            parts.append('{+%s+}' % _text(actual[j1:j2]))
+        position = i2
+
+    end = min(len(expected), position + CONTEXT)
+    parts.append(_text(expected[position:end]))
+    if end < len(expected):
+        parts.append('...')
+    desc.append_text('\n          ' + ''.join(parts))
+
+
+def _describe_items(result, desc):
+    """ Lists the removed and inserted items with their index """
+    expected, actual = result.expected, result.actual
+    hunks = result.hunks
+    if hunks is None:
+        hunks = [(result.start, min(result.start + 1, result.end_expected),
+                  result.start, min(result.start + 1, result.end_actual))]
+
+    for i1, i2, j1, j2 in hunks:
+        for i in range(i1, i2):
+            desc.append_text('\n          - [%d] ' % i).append_description_of(expected[i])
+        for j in range(j1, j2):
+            desc.append_text('\n          + [%d] ' % j).append_description_of(actual[j])
+
+
+def diffable(expected, actual):
+    """ Checks if the differences between two values can be described """
+    if isinstance(expected, str):
+        valid = isinstance(actual, str)
+    elif isinstance(expected, bytes):
+        valid = isinstance(actual, bytes)
+    elif isinstance(expected, list):
+        valid = isinstance(actual, list)
+    elif isinstance(expected, tuple):
+        valid = isinstance(actual, tuple)
+    else:
+        return False
+    return valid and max(len(expected), len(actual)) >= MIN_SIZE
@@ -2,10 +2,13 @@
 Defines the expectation class which is the basis for performing the assertions.
 """
 import re
-import hamcrest as hc
+import sys
+import contextvars
+from types import GeneratorType
+from collections.abc import Awaitable
 
-from .patched import IsNot
-from .matchers import lookup, suggest, ContextManagerResult
+from .matchers import lookup, MatcherNotFound, ContextManagerResult
+from . import instrument
 
 __author__ = "Ivan -DrSlump- Montes"
 __email__ = "drslump@pollinimini.net"
@@ -23,12 +26,165 @@ class OPERATOR:
     BUT = 1
 
 
+# Cache of parsed attribute names as name:(coordinator, negated, alias)
+_parsed_names = {}
+# Maximum number of entries kept in the parsed names cache
+PARSE_CACHE_SIZE = 1024
+
+_COORDINATORS = {
+    'and': OPERATOR.AND,
+    'or': OPERATOR.OR,
+    'but': OPERATOR.BUT,
+}
+
+
+def _parse_name(name):
+    """ Splits an attribute name into its coordinator operator (or None), a
+        negation flag and the matcher alias (or None if not given). Results
+        are cached since the same names are used over and over.
+    """
+    try:
+        return _parsed_names[name]
+    except KeyError:
+        pass
+
+    # Normalize the name
+    parts = re.sub(r'([a-z])([A-Z])', r'\1_\2', name).lower().split('_')
+
+    # Check if we have a coordinator as first item
+    coordinator = _COORDINATORS.get(parts[0])
+    if coordinator is not None:
+        parts.pop(0)
+
+    # Negation can come just after a combinator (ie: .and_not_be_equal)
+    negated = 'not' in parts
+    if negated:
+        parts.pop(parts.index('not'))
+
+    parsed = (coordinator, negated, '_'.join(parts) or None)
+
+    if len(_parsed_names) >= PARSE_CACHE_SIZE:
+        _parsed_names.clear()
+    _parsed_names[name] = parsed
+
+    return parsed
+
+
+# Shared tuples of operators as (coordinator, negated):operators
+_operator_tuples = {}
+
+
+def _operators(coordinator, negated):
+    """ Obtains a shared tuple with the operators to push into an expression """
+    key = (coordinator, negated)
+    try:
+        return _operator_tuples[key]
+    except KeyError:
+        ops = () if coordinator is None else (coordinator,)
+        if negated:
+            ops += (OPERATOR.NOT,)
+        _operator_tuples[key] = ops
+        return ops
+
+
+# Hamcrest and the quantifiers are bound by _load_deps() when first needed,
+# which is after looking up a matcher, to keep importing pyshould cheap.
+hc = BoundedDescription = IsNot = EveryItem = SomeItem = NoItem = None
+
+
+def _load_deps():
+    global hc, BoundedDescription, IsNot, EveryItem, SomeItem, NoItem
+    import hamcrest
+    from .description import BoundedDescription
+    from .patched import IsNot
+    from .quantifiers import EveryItem, SomeItem, NoItem
+    # Bound the last since it signals the others are available
+    hc = hamcrest
+
+
+# Flag of generator based coroutines (ie: types.coroutine) as in inspect
+CO_ITERABLE_COROUTINE = 0x100
+
+
+def is_awaitable(value):
+    """ Same as inspect.isawaitable without importing inspect on startup """
+    return (isinstance(value, Awaitable)
+            or isinstance(value, GeneratorType)
+            and bool(value.gi_code.co_flags & CO_ITERABLE_COROUTINE))
+
+
+def in_event_loop():
+    """ Checks if an asyncio event loop is running in this thread, there can
+        be none if asyncio was not even imported.
+    """
+    asyncio = sys.modules.get('asyncio')
+    return asyncio is not None and asyncio._get_running_loop() is not None
+
+
+def assert_match(value, matcher):
+    """ Asserts the value against the matcher like hamcrest's assert_that but
+        asking the matcher to describe a mismatch in the same pass, so values
+        which can be consumed just once (ie: generators) are reported properly.
+        Descriptions are bounded by the budget in the description module.
+    """
+    if hc is None:
+        _load_deps()
+
+    mismatch = BoundedDescription()
+    if not matcher.matches(value, mismatch):
+        raise failure(matcher, mismatch)
+
+
+def failure(matcher, mismatch):
+    """ Builds the assertion error for a matcher and its mismatch description """
+    if hc is None:
+        _load_deps()
+
+    # Each part is bounded on its own so a long expected value does not
+    # leave the mismatch out
+    expected = BoundedDescription()
+    expected.append_description_of(matcher)
+    return AssertionError('\nExpected: {0}\n     but: {1}\n'.format(expected, mismatch))
+
+
+# Expectations entered as context managers, as a stack of (entered, clone)
+# pairs. Each thread and asyncio task sees its own stack, so blocks running
+# concurrently do not resolve each other's expectations.
+_contexts = contextvars.ContextVar('pyshould_contexts', default=())
+
+
+def _expr_tokens(expr):
+    """ Obtains the tokens of a persistent expression in insertion order.
+        Expressions are stored as cons cells (item, previous) so clones can
+        share their common prefix, with None representing the empty one. An
+        item is either a matcher or a tuple of operators.
+    """
+    items = []
+    while expr is not None:
+        items.append(expr[0])
+        expr = expr[1]
+
+    tokens = []
+    for item in reversed(items):
+        if isinstance(item, tuple):
+            tokens.extend(item)
+        else:
+            tokens.append(item)
+    return tokens
+
+
 class Expectation(object):
     """ Represents an expectation allowing to configure it with matchers and
         finally resolving it.
     """
 
-    _contexts = []
+    __slots__ = ('value', 'deferred', 'factory', 'description', 'def_op',
+                 'def_matcher', 'transform', 'expr', 'matcher', 'last_matcher',
+                 'parallelism', '_compiled', '_aliases')
+
+    # Make NumPy arrays defer to our reflected operators (ie: array | should)
+    # instead of broadcasting the operation over their items.
+    __array_ufunc__ = None
 
     def __init__(self, value=None, deferred=False, description=None, factory=False,
                  def_op=OPERATOR.AND, def_matcher='equal'):
@@ -40,20 +196,45 @@ class Expectation(object):
         self.def_op = def_op
         self.def_matcher = def_matcher
         self.transform = None
+        self.parallelism = None
+        if instrument.listeners:
+            instrument.emit(instrument.CONSTRUCT, expectation=self)
 
     def reset(self):
         """ Resets the state of the expression """
-        self.expr = []
+        self.expr = None
         self.matcher = None
         self.last_matcher = None
         self.description = None
+        self._compiled = None
+        # Aliases used, only tracked while being instrumented
+        self._aliases = None
 
     def clone(self):
-        """ Clone this expression """
-        from copy import copy
-        clone = copy(self)
-        clone.expr = copy(self.expr)
+        """ Clone this expression. Since the expression is immutable the
+            clone shares it with the original one.
+        """
+        clone = object.__new__(self.__class__)
+        clone.value = self.value
+        clone.deferred = self.deferred
         clone.factory = False
+        clone.description = self.description
+        clone.def_op = self.def_op
+        clone.def_matcher = self.def_matcher
+        clone.transform = self.transform
+        clone.parallelism = self.parallelism
+        clone.expr = self.expr
+        clone.matcher = self.matcher
+        clone.last_matcher = self.last_matcher
+        clone._compiled = self._compiled
+        clone._aliases = self._aliases
+        return clone
+
+    def _spawn(self):
+        """ Obtains a new expectation from a factory one (ie: `should`) """
+        clone = self.clone()
+        if instrument.listeners:
+            instrument.emit(instrument.CONSTRUCT, expectation=clone)
         return clone
 
     def __ror__(self, lvalue):
@@ -64,8 +245,20 @@ class Expectation(object):
             Note: We clone and return that clone instead of the self object because
                   resolving resets the expectation, when using a REPL it's nice to see
                   the expectation explanation after a successful one.
+
+            When the left hand side is awaitable (ie: a coroutine), or there are
+            async callbacks, and an event loop is running the resolution is deferred
+            until the returned coroutine is awaited, warning if it never is.
+            Quantified expectations do the same for async iterables (ie: async
+            generators). Otherwise they are checked like any other value.
         """
         clone = self.clone()
+        if in_event_loop() and (self._is_async(lvalue) or self._awaits_callbacks()):
+            from .aio import Resolution
+            if self.deferred:
+                self.reset()
+            return Resolution(clone.resolve_async(lvalue))
+
         self.resolve(lvalue)
         return clone
 
@@ -80,7 +273,11 @@ class Expectation(object):
 
     def resolve(self, value=None):
         """ Resolve the current expression against the supplied value """
+        if instrument.listeners:
+            return instrument.resolve(self, value)
+        return self._resolve(value)
 
+    def _resolve(self, value):
         # If we still have an uninitialized matcher init it now
         if self.matcher:
             self._init_matcher()
@@ -99,19 +296,41 @@ class Expectation(object):
             if self.deferred:
                 self.reset()
 
+    def resolve_async(self, value=None):
+        """ Obtains a coroutine resolving the expression once the value, which
+            can be awaitable, is available. The matchers are evaluated on a
+            worker thread so the event loop is not blocked.
+        """
+        from . import aio
+        return aio.resolve(self, value)
+
+    def _is_async(self, value):
+        """ Checks if the value must be resolved with `resolve_async` """
+        return is_awaitable(value)
+
+    def _awaits_callbacks(self):
+        """ Checks if the expression has callbacks returning awaitables """
+        return any(getattr(token, 'asynchronous', False)
+                   for token in _expr_tokens(self.expr))
+
     def _assertion(self, matcher, value):
         """ Perform the actual assertion for the given matcher and value. Override
             this method to apply a special configuration when performing the assertion.
             If the assertion fails it should raise an AssertionError.
         """
         # To support the syntax `any_of(subject) | should ...` we check if the
-        # value to check is an Expectation object and if it is we use the descriptor
-        # protocol to bind the value's assertion logic to this expectation.
+        # value to check is an Expectation object and if it is we use its
+        # quantifier to wrap the matcher of this expectation.
         if isinstance(value, Expectation):
-            assertion = value._assertion.__get__(self, Expectation)
-            assertion(matcher, value.value)
+            assert_match(value.value, value._quantify(matcher))
         else:
-            hc.assert_that(value, matcher)
+            assert_match(value, self._quantify(matcher))
+
+    def _quantify(self, matcher):
+        """ Wraps the matcher built from the expression to apply the semantics
+            of this kind of expectation (ie: negation or quantifiers).
+        """
+        return matcher
 
     def _transform(self, value):
         """ Applies any defined transformation to the given value
@@ -127,10 +346,8 @@ class Expectation(object):
 
         return value
 
-    def evaluate(self):
-        """ Converts the current expression into a single matcher, applying
-            coordination operators to operands according to their binding rules
-        """
+    def _rpn(self):
+        """ Converts the current expression into Reverse Polish Notation """
 
         # Apply Shunting Yard algorithm to convert the infix expression
         # into Reverse Polish Notation. Since we have a very limited
@@ -139,7 +356,7 @@ class Expectation(object):
         # and operators identifiers (ints).
         ops = []
         rpn = []
-        for token in self.expr:
+        for token in _expr_tokens(self.expr):
             if isinstance(token, int):
                 while len(ops) and token <= ops[-1]:
                     rpn.append(ops.pop())
@@ -151,9 +368,18 @@ class Expectation(object):
         while len(ops):
             rpn.append(ops.pop())
 
+        return rpn
+
+    def evaluate(self):
+        """ Converts the current expression into a single matcher, applying
+            coordination operators to operands according to their binding rules
+        """
+        if hc is None:
+            _load_deps()
+
         # Walk the RPN expression to create AllOf/AnyOf matchers
         stack = []
-        for token in rpn:
+        for token in self._rpn():
             if isinstance(token, int):
                 # Handle the NOT case in a special way since it's unary
                 if token == OPERATOR.NOT:
@@ -191,17 +417,7 @@ class Expectation(object):
         """
         matcher = lookup(alias)
         if not matcher:
-            msg = 'Matcher "%s" not found' % alias
-
-            # Try to find similarly named matchers to help the user
-            similar = suggest(alias, max=3, cutoff=0.5)
-            if len(similar) > 1:
-                last = similar.pop()
-                msg += '. Perhaps you meant to use %s or %s?' % (', '.join(similar), last)
-            elif len(similar) > 0:
-                msg += '. Perhaps you meant to use %s?' % similar.pop()
-
-            raise KeyError(msg)
+            raise MatcherNotFound(alias)
 
         return matcher
 
@@ -215,10 +431,54 @@ class Expectation(object):
         kwargs = dict((k, fn(v)) for k, v in kwargs.items())
 
         matcher = self.matcher(*args, **kwargs)
-        self.expr.append(matcher)
+        self.expr = (matcher, self.expr)
         self.matcher = None
         return matcher
 
+    def compile(self):
+        """ Freezes the current expression into an immutable checker which can
+            be reused for many values without paying for the DSL each time.
+        """
+        # Since expressions are immutable we can reuse the last compiled
+        # checker as long as the state it was built from has not changed
+        key = (self.expr, self.matcher, self.description, self.transform,
+               self.parallelism)
+        cached = self._compiled
+        if cached is not None and all(a is b for a, b in zip(key, cached[0])):
+            return cached[1]
+
+        exp = self.clone()
+        if exp.matcher:
+            exp._init_matcher()
+
+        if not exp.expr:
+            raise TypeError('No matchers set. Usage: should.<matcher>(<expectation>).compile()')
+
+        checker = CompiledExpectation(exp)
+        self._compiled = (key, checker)
+        return checker
+
+    def matches(self, value):
+        """ Checks the value against the expectation returning a boolean instead
+            of raising an AssertionError. No mismatch description is generated.
+        """
+        return self.compile().matches(value)
+
+    def explain(self, value=None, analyze=False, file=None):
+        """ Prints the plan of the expression, the tree of operators and matchers
+            it's converted to. When analyzing, the value is checked against it
+            reporting for each node how many times it was evaluated, how many of
+            them short-circuited its operands and the time spent on it.
+        """
+        from . import plan
+
+        result, exp = plan.build(self)
+        if analyze:
+            result.analyze(value, exp._transform)
+
+        (file or sys.stdout).write(str(result) + '\n')
+        return result
+
     def described_as(self, description, *args):
         """ Specify a custom message for the matcher """
         if len(args):
@@ -230,28 +490,25 @@ class Expectation(object):
         """ Just an alias to described_as """
         return self.described_as(description, *args)
 
-    def __getattribute__(self, name):
-        """ Hijack property access to handle some special cases.
-            Since we might have patched the root object to include
-            the `should` properties, we have to capture their use
-            here.
-        """
+    # Since we might have patched the root object to include the `should`
+    # properties, we have to override them here to ignore their use. Other
+    # capitalizations are handled when interpreting the attribute name.
+    @property
+    def should(self):
+        return self
 
-        # Ignore .should. style properties
-        lowname = name.lower()
-        if lowname in ('should', 'to'):
-            return self
-        if lowname == 'should_not':
-            return ExpectationNot(
-                self.value,
-                self.deferred,
-                self.description,
-                self.factory,
-                self.def_op,
-                self.def_matcher
-            )
-
-        return object.__getattribute__(self, name)
+    to = should
+
+    @property
+    def should_not(self):
+        return ExpectationNot(
+            self.value,
+            self.deferred,
+            self.description,
+            self.factory,
+            self.def_op,
+            self.def_matcher
+        )
 
     def __getattr__(self, name):
         """ Overload property access to interpret them as matchers. """
@@ -260,10 +517,15 @@ class Expectation(object):
         if name[0:2] == '__':
             raise AttributeError
 
+        # Ignore .should. style properties
+        lowname = name.lower()
+        if lowname in ('should', 'to', 'should_not'):
+            return getattr(self, lowname)
+
         # In factory mode we always create a new instance. This avoids
         # problems when defining multiple expectations using the `should`
         # keyword without resolving every expectation in order.
-        obj = self.clone() if self.factory else self
+        obj = self._spawn() if self.factory else self
 
         # If we still have an uninitialized matcher then init it now
         if obj.matcher:
@@ -272,43 +534,25 @@ class Expectation(object):
             if not obj.deferred:
                 obj.resolve(obj.value)
 
-        # Normalize the name
-        name = re.sub(r'([a-z])([A-Z])', r'\1_\2', name)
-        parts = name.lower().split('_')
-
-        # Check if we have a coordinator as first item
-        expr = []
-        if parts[0] == 'and':
-            expr.append(OPERATOR.AND)
-            parts.pop(0)
-        elif parts[0] == 'or':
-            expr.append(OPERATOR.OR)
-            parts.pop(0)
-        elif parts[0] == 'but':
-            expr.append(OPERATOR.BUT)
-            parts.pop(0)
+        coordinator, negated, alias = _parse_name(name)
+
         # If no coordinator is given assume a default one
-        elif len(obj.expr):
-            expr.append(obj.def_op)
+        if coordinator is None and obj.expr is not None:
+            coordinator = obj.def_op
 
         # Negation can come just after a combinator (ie: .and_not_be_equal)
-        if 'not' in parts:
-            expr.append(OPERATOR.NOT)
-            parts.pop(parts.index('not'))
+        ops = _operators(coordinator, negated)
 
-        if len(parts):
-            name = '_'.join(parts)
-        else:
-            name = obj.last_matcher or obj.def_matcher
+        name = alias or obj.last_matcher or obj.def_matcher
 
-        # Find a matcher for the computed name
-        try:
-            obj.matcher = obj._find_matcher(name)
-            obj.last_matcher = name
-            obj.expr.extend(expr)
-        except KeyError as ex:
-            # Signal correctly for `hasattr`
-            raise AttributeError(str(ex))
+        # Find a matcher for the computed name, the error raised is also an
+        # AttributeError to signal correctly for `hasattr`
+        obj.matcher = obj._find_matcher(name)
+        obj.last_matcher = name
+        if instrument.listeners:
+            obj._aliases = (name, obj._aliases)
+        if ops:
+            obj.expr = (ops, obj.expr)
 
         return obj
 
@@ -321,7 +565,7 @@ class Expectation(object):
         if (len(args) == 1 and hasattr(args[0], '__call__')
                 and not self.expr and not self.matcher):
             # We have to clone the expectation so we play fair with the `should` shortcut
-            clone = self.clone()
+            clone = self._spawn() if self.factory else self.clone()
             clone.transform = args[0]
             return clone
 
@@ -339,34 +583,51 @@ class Expectation(object):
     def __enter__(self):
         """ Implements the context manager protocol. Specially useful for asserting exceptions
         """
-        clone = self.clone()
-        self._contexts.append(clone)
+        _contexts.set(_contexts.get() + ((self, self.clone()),))
         self.reset()
         return self
 
     def __exit__(self, exc, value, trace):
+        expr = self._exit_context()
+
         # If an assertion failed inside the block just raise that one
         if isinstance(value, AssertionError):
             return False
 
-        expr = self._contexts.pop()
         result = ContextManagerResult(exc, value, trace)
         expr.resolve(result)
         return True
 
+    def _exit_context(self):
+        """ Removes from the stack of entered expectations the innermost one
+            entered with this object, returning its clone to be resolved.
+        """
+        stack = _contexts.get()
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i][0] is self:
+                _contexts.set(stack[:i] + stack[i + 1:])
+                return stack[i][1]
+
+        raise RuntimeError('Exiting an expectation which was not entered')
+
+    def __aenter__(self):
+        """ Implements the asynchronous context manager protocol (async with) """
+        from . import aio
+        return aio.enter(self)
+
+    def __aexit__(self, exc, value, trace):
+        from . import aio
+        return aio.exit(self, exc, value, trace)
+
     def __eq__(self, other):
         """ Overloads the equality operator to trigger a resolution of the matcher
             against the other expression value. This allows to easily use expressions
             in other libraries like Mock.
         """
-        clone = self.clone()
         try:
-            clone.resolve(other)
-            return True
-        except AssertionError:
-            return False
+            return self.matches(other)
         # Any exception is silenced and we just return false
-        except:
+        except Exception:
             return False
 
     def __ne__(self, other):
@@ -392,31 +653,147 @@ class Expectation(object):
 class ExpectationNot(Expectation):
     """ Negates the result of the matcher """
 
-    def _assertion(self, matcher, value):
-        hc.assert_that(value, IsNot(matcher))
+    __slots__ = ()
+
+    def _quantify(self, matcher):
+        if hc is None:
+            _load_deps()
+        return IsNot(matcher)
 
 
 class ExpectationAny(Expectation):
     """ Succeeds if any of the items in an iterable value passes the matcher """
 
-    def _assertion(self, matcher, value):
-        hc.assert_that(value, hc.has_item(matcher))
+    __slots__ = ()
+
+    def parallel(self, workers=None, backend='thread', chunksize=None):
+        """ Checks the items concurrently on a pool of workers (defaults to the
+            number of CPUs). The backend can be 'thread', 'process' or an
+            existing executor. The process backend requires the matchers
+            (and callbacks) to be picklable. For async iterables `workers`
+            is the number of items checked at once.
+        """
+        obj = self._spawn() if self.factory else self
+        from .parallel import Parallelism
+        obj.parallelism = Parallelism(workers, backend, chunksize)
+        return obj
+
+    def _quantify(self, matcher):
+        if hc is None:
+            _load_deps()
+        return SomeItem(matcher, self.parallelism)
+
+    def _is_async(self, value):
+        return is_awaitable(value) or hasattr(value, '__aiter__')
+
+    def resolve_async(self, value=None):
+        """ Like `Expectation.resolve_async` but async iterables are consumed
+            with `async for`, checking their items concurrently. The number
+            of items checked at once can be configured with `parallel`.
+        """
+        from . import aio
+        return aio.resolve_items(self, value)
 
     def _transform(self, value):
+        # Items are transformed lazily as the quantifier consumes them
         if self.transform:
-            value = [super(ExpectationAny, self)._transform(x) for x in value]
+            value = (self._transform_item(x) for x in value)
         return value
 
+    def _transform_item(self, item):
+        return super(ExpectationAny, self)._transform(item)
+
 
 class ExpectationAll(ExpectationAny):
     """ Succeeds if all of the items in an iterable value pass the matcher """
 
-    def _assertion(self, matcher, value):
-        hc.assert_that(value, hc.only_contains(matcher))
+    __slots__ = ()
+
+    def _quantify(self, matcher):
+        if hc is None:
+            _load_deps()
+        return EveryItem(matcher, self.parallelism)
 
 
 class ExpectationNone(ExpectationAny):
     """ Succeeds if none of the items in an iterable value passes the matcher """
 
-    def _assertion(self, matcher, value):
-        hc.assert_that(value, IsNot(hc.has_item(matcher)))
+    __slots__ = ()
+
+    def _quantify(self, matcher):
+        if hc is None:
+            _load_deps()
+        return NoItem(matcher, self.parallelism)
+
+
+class CompiledExpectation(object):
+    """ Immutable checker obtained by compiling an expectation. It holds the
+        finished matcher tree so checking values against it skips building
+        the expression again. Instances can be shared among threads as long
+        as the matchers used do not keep state of their own (ie: throw).
+    """
+
+    __slots__ = ('matcher', '_base', '_quantify', '_transform', '_aliases')
+
+    __array_ufunc__ = None
+
+    def __init__(self, expectation):
+        base = expectation.evaluate()
+        setter = super(CompiledExpectation, self).__setattr__
+        setter('_base', base)
+        setter('_quantify', expectation._quantify)
+        setter('_transform', expectation._transform)
+        setter('matcher', expectation._quantify(base))
+        setter('_aliases', expectation._aliases)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Compiled expectations are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Compiled expectations are immutable')
+
+    def _subject(self, value):
+        """ Obtains the matcher and value to use for the given subject """
+        if isinstance(value, Expectation):
+            return value._quantify(self._base), value.value
+        return self.matcher, self._transform(value)
+
+    def check(self, value):
+        """ Checks the value raising an AssertionError if it doesn't match """
+        if instrument.listeners:
+            with instrument.observe(self):
+                return self._check(value)
+        return self._check(value)
+
+    def _check(self, value):
+        matcher, value = self._subject(value)
+        assert_match(value, matcher)
+
+    def matches(self, value):
+        """ Checks the value returning a boolean instead of raising """
+        if instrument.listeners:
+            with instrument.observe(self):
+                return self._matches(value)
+        return self._matches(value)
+
+    def _matches(self, value):
+        # Transformations and nested expectations signal failures by raising
+        try:
+            matcher, value = self._subject(value)
+            return matcher.matches(value)
+        except AssertionError:
+            return False
+
+    def __ror__(self, lvalue):
+        """ Allows to use the checker with the pipe operator like a normal expectation """
+        self.check(lvalue)
+        return self
+
+    def __eq__(self, other):
+        return self.matches(other)
+
+    def __ne__(self, other):
+        return not self.matches(other)
+
+    def __repr__(self):
+        return str(self.matcher)
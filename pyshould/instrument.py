@@ -0,0 +1,199 @@
+"""
+Hooks to observe the evaluation of expectations. Listeners are subscribed
+with `subscribe` and called with an `Event` for:
+
+    construct       a new expectation is created (ie: `should.xxx`)
+    lookup          an alias is looked up, `matcher` is None on a miss
+    resolve_start   an expectation starts resolving against a value
+    resolve_end     it finished, with the `elapsed` wall time in seconds
+    failure         it failed, with the `error` raised
+
+Events are only built when there are listeners, so the overhead otherwise is
+just checking `listeners`. Listeners are called synchronously from the thread
+evaluating the expectation and must be thread safe.
+
+    counter = subscribe(AliasCounter())
+    ...
+    counter.resolves.most_common(10)
+"""
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+CONSTRUCT = 'construct'
+LOOKUP = 'lookup'
+RESOLVE_START = 'resolve_start'
+RESOLVE_END = 'resolve_end'
+FAILURE = 'failure'
+
+# Subscribed listeners. It's replaced instead of mutated so it can be
+# iterated without locking while others subscribe.
+listeners = ()
+
+_lock = threading.Lock()
+
+
+class Event(object):
+    """ Information about something that happened evaluating an expectation """
+
+    __slots__ = ('kind', 'expectation', 'alias', 'aliases', 'matcher', 'cached',
+                 'elapsed', 'error')
+
+    def __init__(self, kind, expectation=None, alias=None, aliases=(), matcher=None,
+                 cached=False, elapsed=None, error=None):
+        self.kind = kind
+        self.expectation = expectation
+        self.alias = alias
+        self.aliases = aliases
+        self.matcher = matcher
+        self.cached = cached
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self):
+        return '<Event {0} {1}>'.format(self.kind, self.alias or ', '.join(self.aliases))
+
+
+def subscribe(listener):
+    """ Registers a callable to receive the events, returning it """
+    global listeners
+    with _lock:
+        listeners = listeners + (listener,)
+    return listener
+
+
+def unsubscribe(listener):
+    """ Removes a listener, returns False if it was not subscribed """
+    global listeners
+    with _lock:
+        if listener not in listeners:
+            return False
+        index = listeners.index(listener)
+        listeners = listeners[:index] + listeners[index + 1:]
+    return True
+
+
+@contextmanager
+def listening(listener):
+    """ Subscribes the listener while running the block """
+    subscribe(listener)
+    try:
+        yield listener
+    finally:
+        unsubscribe(listener)
+
+
+def emit(kind, **kwargs):
+    """ Notifies an event to the listeners """
+    event = Event(kind, **kwargs)
+    for listener in listeners:
+        listener(event)
+
+
+def aliases(expectation):
+    """ Obtains the aliases used by an expectation while it was observed """
+    items = []
+    cell = expectation._aliases
+    while cell is not None:
+        items.append(cell[0])
+        cell = cell[1]
+    return tuple(reversed(items))
+
+
+@contextmanager
+def observe(expectation):
+    """ Notifies the listeners around the block resolving the expectation """
+    used = aliases(expectation)
+    emit(RESOLVE_START, expectation=expectation, aliases=used)
+
+    start = time.perf_counter()
+    try:
+        yield expectation
+    except Exception as ex:
+        elapsed = time.perf_counter() - start
+        if isinstance(ex, AssertionError):
+            emit(FAILURE, expectation=expectation, aliases=used, elapsed=elapsed, error=ex)
+        emit(RESOLVE_END, expectation=expectation, aliases=used, elapsed=elapsed, error=ex)
+        raise
+
+    emit(RESOLVE_END, expectation=expectation, aliases=used,
+         elapsed=time.perf_counter() - start)
+
+
+def resolve(expectation, value):
+    """ Resolves the expectation notifying the listeners """
+    with observe(expectation):
+        expectation._resolve(value)
+
+
+class AliasCounter(object):
+    """ Counts per alias the lookups, misses, resolutions and failures """
+
+    def __init__(self):
+        self.lookups = Counter()
+        self.misses = Counter()
+        self.resolves = Counter()
+        self.failures = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.kind == LOOKUP:
+            with self._lock:
+                self.lookups[event.alias] += 1
+                if event.matcher is None:
+                    self.misses[event.alias] += 1
+        elif event.kind == RESOLVE_END:
+            with self._lock:
+                self.resolves.update(event.aliases)
+        elif event.kind == FAILURE:
+            with self._lock:
+                self.failures.update(event.aliases)
+
+
+class LatencyHistogram(object):
+    """ Histogram per alias of the time taken by the resolutions using it.
+        Bucket `i` counts the ones taking less than 2**i microseconds, the
+        last one collects any slower resolution.
+    """
+
+    def __init__(self, buckets=24):
+        self.buckets = buckets
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.kind != RESOLVE_END:
+            return
+
+        bucket = min(int(event.elapsed * 1e6).bit_length(), self.buckets - 1)
+        with self._lock:
+            for alias in set(event.aliases):
+                histogram = self.histograms.get(alias)
+                if histogram is None:
+                    histogram = self.histograms[alias] = [0] * self.buckets
+                histogram[bucket] += 1
+
+    def count(self, alias):
+        return sum(self.histograms.get(alias, ()))
+
+    def percentile(self, alias, percent):
+        """ Upper bound in microseconds of the bucket holding the percentile,
+            or None if the alias was not observed.
+        """
+        histogram = self.histograms.get(alias)
+        if not histogram:
+            return None
+
+        target = sum(histogram) * percent / 100.0
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if count and seen >= target:
+                return 2 ** bucket
+        return 2 ** (self.buckets - 1)
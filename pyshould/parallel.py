@@ -0,0 +1,141 @@
+"""
+Evaluates quantifiers on a pool of workers. The subject is split in chunks
+which are checked concurrently, once a chunk gives a decisive result (ie: a
+failure for should_all) the chunks after it are cancelled. The result is the
+same the sequential evaluation would report, since the earliest decisive
+chunk always wins.
+"""
+import os
+from itertools import islice
+from concurrent.futures import (
+    Executor, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+)
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+BACKENDS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+# Chunk size used when the length of the subject is unknown
+DEFAULT_CHUNKSIZE = 1024
+
+# Number of chunks per worker we aim for when the length is known
+CHUNKS_PER_WORKER = 4
+
+
+class Parallelism(object):
+    """ Configuration for the parallel evaluation of a quantifier """
+
+    def __init__(self, workers=None, backend='thread', chunksize=None):
+        if not isinstance(backend, Executor) and backend not in BACKENDS:
+            raise ValueError('Unknown parallel backend "{0}", use one of: {1}'.format(
+                backend, ', '.join(sorted(BACKENDS))))
+
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.chunksize = chunksize
+
+    def executor(self):
+        """ Obtains the executor to use and if we own it (and must shut it down) """
+        if isinstance(self.backend, Executor):
+            return self.backend, False
+        return BACKENDS[self.backend](max_workers=self.workers), True
+
+    def chunks(self, value, iterator):
+        """ Splits the iterator in lists of items """
+        size = self.chunksize
+        if not size:
+            try:
+                size = -(-len(value) // (self.workers * CHUNKS_PER_WORKER))
+            except TypeError:
+                size = DEFAULT_CHUNKSIZE
+
+        size = max(1, size)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def check_chunk(quantifier_cls, matcher, chunk):
+    """ Checks a chunk returning the result and report if it's decisive """
+    quantifier = quantifier_cls(matcher)
+    result, report = quantifier._stream(iter(chunk), True)
+    if quantifier._decisive(result):
+        return result, report
+    return None
+
+
+def evaluate(quantifier, value, iterator, parallelism, max_firsts=0):
+    """ Checks the chunks of the iterator concurrently. Returns the decisive
+        outcome with the chunk offset applied, or None if no chunk was
+        decisive, together with the number of items and the first items.
+    """
+    executor, owned = parallelism.executor()
+    # Keep a bounded number of chunks in flight to support large streams
+    max_pending = parallelism.workers * 2
+    chunks = parallelism.chunks(value, iterator)
+
+    pending = {}
+    decided = None
+    outcome = None
+    firsts = []
+    total = 0
+    index = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and decided is None and len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+
+                if len(firsts) < max_firsts:
+                    firsts.extend(chunk[:max_firsts - len(firsts)])
+
+                future = executor.submit(
+                    check_chunk, quantifier.__class__, quantifier.matcher, chunk)
+                pending[future] = (index, total)
+                total += len(chunk)
+                index += 1
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_index, offset = pending.pop(future)
+                result = future.result()
+                if result is not None and (decided is None or chunk_index < decided):
+                    decided = chunk_index
+                    outcome = _offset(result, offset)
+
+            # Only the chunks before the decisive one can change the outcome
+            if decided is not None:
+                for future, (chunk_index, _) in list(pending.items()):
+                    if chunk_index > decided:
+                        future.cancel()
+                        del pending[future]
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+    return outcome, total, firsts
+
+
+def _offset(outcome, offset):
+    """ Converts the index in a report from the chunk to the whole subject """
+    result, report = outcome
+    if report is not None and report[0] in ('failed', 'matched'):
+        report = (report[0], report[1] + offset) + report[2:]
+    return result, report
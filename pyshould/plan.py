@@ -0,0 +1,187 @@
+"""
+Builds the plan of an expectation: the tree of operators and matchers its
+expression is converted to. Like the EXPLAIN ANALYZE of databases the plan
+can be analyzed against a value, reporting for each node how many times it
+was evaluated, how many of those short-circuited its operands and the time
+spent on it (including its operands).
+"""
+import time
+
+import hamcrest as hc
+from hamcrest.core.base_matcher import BaseMatcher
+
+from .expectation import OPERATOR
+from .patched import IsNot
+from .quantifiers import EveryItem, SomeItem, NoItem
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+OPERATORS = {
+    OPERATOR.NOT: 'NOT',
+    OPERATOR.AND: 'AND',
+    OPERATOR.OR: 'OR',
+    OPERATOR.BUT: 'BUT',
+}
+
+# Labels for the matchers wrapping the expression to apply the semantics
+# of the expectation (ie: should_not, should_all)
+WRAPPERS = {
+    IsNot: 'NOT',
+    EveryItem: 'EVERY ITEM',
+    SomeItem: 'SOME ITEM',
+    NoItem: 'NO ITEM',
+}
+
+
+class PlanNode(object):
+    """ Node of the plan. The `build` callable creates its matcher from the
+        matchers of its children.
+    """
+
+    def __init__(self, label, build, children=()):
+        self.label = label
+        self.build = build
+        self.children = list(children)
+        self.evaluations = 0
+        self.short_circuits = 0
+        self.elapsed = 0.0
+
+    def probe(self):
+        """ Builds the matcher for the node gathering its statistics """
+        return Probe(self, self.build(*[c.probe() for c in self.children]))
+
+    def render(self, analyzed, depth=0):
+        line = '  ' * depth + self.label
+        if analyzed:
+            if not self.evaluations:
+                line += '  [never evaluated]'
+            elif len(self.children) > 1:
+                line += '  [evaluations={0}, short-circuits={1}, time={2}]'.format(
+                    self.evaluations, self.short_circuits, _format(self.elapsed))
+            else:
+                line += '  [evaluations={0}, time={1}]'.format(
+                    self.evaluations, _format(self.elapsed))
+
+        lines = [line]
+        for child in self.children:
+            lines.extend(child.render(analyzed, depth + 1))
+        return lines
+
+
+class Probe(BaseMatcher):
+    """ Forwards to the matcher of a node recording its statistics """
+
+    def __init__(self, node, matcher):
+        self.node = node
+        self.matcher = matcher
+
+    def matches(self, item, mismatch_description=None):
+        node = self.node
+        before = [c.evaluations for c in node.children]
+        start = time.perf_counter()
+        try:
+            return self.matcher.matches(item, mismatch_description)
+        finally:
+            node.elapsed += time.perf_counter() - start
+            node.evaluations += 1
+            # Operands not evaluated this time were short-circuited
+            if len(before) > 1 and any(c.evaluations == count
+                                       for c, count in zip(node.children, before)):
+                node.short_circuits += 1
+
+    def describe_to(self, desc):
+        self.matcher.describe_to(desc)
+
+    def describe_mismatch(self, item, desc):
+        self.matcher.describe_mismatch(item, desc)
+
+
+class Plan(object):
+    """ Plan of an expectation, once analyzed it includes the outcome """
+
+    def __init__(self, root):
+        self.root = root
+        self.analyzed = False
+        self.result = None
+        self.error = None
+
+    def analyze(self, value, transform=None):
+        """ Checks the value against the plan gathering the statistics """
+        self.analyzed = True
+        try:
+            if transform:
+                value = transform(value)
+            self.result = bool(self.root.probe().matches(value))
+        except Exception as ex:
+            self.result = False
+            self.error = ex
+        return self.result
+
+    def __str__(self):
+        lines = self.root.render(self.analyzed)
+        if self.analyzed:
+            if self.error is not None:
+                lines.append('Result: error {0}: {1}'.format(
+                    type(self.error).__name__, self.error))
+            else:
+                lines.append('Result: {0}'.format('matched' if self.result else 'mismatched'))
+            lines.append('Total time: {0}'.format(_format(self.root.elapsed)))
+        return '\n'.join(lines)
+
+
+def build(expectation):
+    """ Builds the plan for an expectation """
+    exp = expectation.clone()
+    if exp.matcher:
+        exp._init_matcher()
+
+    if not exp.expr:
+        raise TypeError('No matchers set. Usage: should.<matcher>(<expectation>).explain()')
+
+    # Probes gather statistics in this process, so evaluate sequentially
+    exp.parallelism = None
+
+    stack = []
+    for token in exp._rpn():
+        if not isinstance(token, int):
+            stack.append(PlanNode(str(token), _constant(token)))
+        elif token == OPERATOR.NOT:
+            stack[-1] = PlanNode('NOT', IsNot, stack[-1:])
+        else:
+            build = hc.any_of if token == OPERATOR.OR else hc.all_of
+            stack[-2:] = [PlanNode(OPERATORS[token], build, stack[-2:])]
+
+    root = stack.pop()
+
+    # The custom description wraps the expression like when evaluating it
+    if exp.description:
+        root = PlanNode('DESCRIBED AS {0!r}'.format(exp.description),
+                        _described_as(exp.description), [root])
+
+    # Include the matcher applying the semantics of the expectation if any
+    marker = hc.anything()
+    wrapper = exp._quantify(marker)
+    if wrapper is not marker:
+        label = WRAPPERS.get(type(wrapper), type(wrapper).__name__)
+        root = PlanNode(label, exp._quantify, [root])
+
+    return Plan(root), exp
+
+
+def _constant(matcher):
+    return lambda: matcher
+
+
+def _described_as(description):
+    return lambda matcher: hc.described_as(description, matcher)
+
+
+def _format(seconds):
+    if seconds >= 1:
+        return '{0:.3f} s'.format(seconds)
+    if seconds >= 1e-3:
+        return '{0:.3f} ms'.format(seconds * 1e3)
+    return '{0:.3f} us'.format(seconds * 1e6)
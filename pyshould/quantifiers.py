@@ -0,0 +1,298 @@
+"""
+Matchers applying an item matcher to the items of an iterable value. They are
+used by the quantified expectations (should_all, should_any, should_none).
+
+Items are consumed lazily and the evaluation stops as soon as the outcome is
+known, so generators of any size can be checked in constant memory. Since an
+iterator can only be consumed once the mismatch is described during the same
+pass when a description is given to `matches`. The number of items reported
+is bounded by `max_failures` in the budget of the description module. Only
+sequences are checked past the first failing item to report more of them.
+
+Matchers can offer a `predicate()` method returning a plain callable, equivalent
+to `matches` for the items it supports and raising TypeError for the others,
+which quantifiers map over chunks of the items of sequences to avoid the
+matcher overhead.
+"""
+from abc import ABCMeta, abstractmethod
+from itertools import islice
+from collections.abc import Sequence
+
+from hamcrest.core.base_matcher import BaseMatcher
+
+from . import vectorized, description
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Number of items checked at once with the predicate of a matcher
+CHUNK_SIZE = 1024
+
+
+class Quantifier(BaseMatcher, metaclass=ABCMeta):
+    """ Base class for the quantifiers. Items are checked until one whose match
+        result is `stops_on`, which gives the outcome (`_item_outcome`), or
+        until exhausting them (`_exhausted`). Subclasses implement `_decide`
+        to interpret the mask of matched items when the value is a NumPy
+        array. All of them return the result and a report tuple used to
+        describe a mismatch. For the parallel evaluation they also tell which
+        chunk results are `_decisive`.
+    """
+
+    # Match result of an item which decides the outcome
+    stops_on = None
+
+    def __init__(self, matcher, parallelism=None):
+        self.matcher = matcher
+        self.parallelism = parallelism
+
+    def _stream(self, iterator, batch=False):
+        predicate = getattr(self.matcher, 'predicate', None)
+        if predicate is not None and batch:
+            return self._stream_chunks(iterator, predicate())
+
+        matches = self.matcher.matches
+        stops_on = self.stops_on
+        limit = description.current().max_failures
+        firsts = []
+        count = 0
+        for value in iterator:
+            if bool(matches(value)) is stops_on:
+                return self._item_outcome(count, value)
+            if count < limit:
+                firsts.append(value)
+            count += 1
+
+        return self._exhausted(count, firsts)
+
+    def _stream_chunks(self, iterator, predicate):
+        """ Checks the items in chunks with the fast predicate offered by the
+            matcher, which is mapped over each chunk without going through
+            `matches`. Chunks with items not supported by the predicate are
+            checked item by item. Only used for sequences, since iterators
+            must not be consumed past the item deciding the outcome.
+        """
+        matches = self.matcher.matches
+        stops_on = self.stops_on
+        limit = description.current().max_failures
+        firsts = []
+        count = 0
+        while True:
+            chunk = list(islice(iterator, CHUNK_SIZE))
+            if not chunk:
+                break
+
+            try:
+                results = list(map(bool, map(predicate, chunk)))
+            except TypeError:
+                results = [bool(matches(value)) for value in chunk]
+
+            try:
+                index = results.index(stops_on)
+                return self._item_outcome(count + index, chunk[index])
+            except ValueError:
+                pass
+
+            if count < limit:
+                firsts.extend(chunk[:limit - count])
+            count += len(chunk)
+
+        return self._exhausted(count, firsts)
+
+    @abstractmethod
+    def _item_outcome(self, index, value):
+        """ Outcome when the item at the index decides it """
+
+    @abstractmethod
+    def _decisive(self, result):
+        """ Checks if the result of a chunk decides the outcome """
+
+    @abstractmethod
+    def _exhausted(self, count, firsts):
+        """ Outcome once all the items were checked without deciding it """
+
+    @abstractmethod
+    def _decide(self, mask, array):
+        """ Outcome for the mask of matched items of a NumPy array """
+
+    def _evaluate(self, item):
+        if vectorized.is_array(item):
+            mask = vectorized.mask(self.matcher, item)
+            if mask is not None:
+                return self._decide(mask, item)
+
+        try:
+            iterator = iter(item)
+        except TypeError:
+            return False, ('was', item)
+
+        if self.parallelism:
+            from . import parallel
+            outcome, count, firsts = parallel.evaluate(
+                self, item, iterator, self.parallelism, description.current().max_failures)
+            return outcome or self._exhausted(count, firsts)
+
+        return self._stream(iterator, isinstance(item, Sequence))
+
+    def _more_items(self, items, report):
+        """ Extends the report of the item deciding the outcome with the next
+            ones that would have decided it too, up to the budget. It's only
+            done to describe a mismatch, and just for sequences since
+            iterators cannot be consumed again.
+        """
+        if report[0] not in ('failed', 'matched') or self.parallelism \
+                or not isinstance(items, Sequence):
+            return report
+
+        limit = description.current().max_failures - 1
+        matches = self.matcher.matches
+        more = []
+        for index in range(report[1] + 1, len(items)):
+            if len(more) >= limit:
+                return report + (tuple(more), True)
+            value = items[index]
+            if bool(matches(value)) is self.stops_on:
+                more.append((index, value))
+        return report + (tuple(more), False)
+
+    def matches(self, item, mismatch_description=None):
+        result, report = self._evaluate(item)
+        if not result:
+            if mismatch_description is not None:
+                self._describe(self._more_items(item, report), mismatch_description)
+        return result
+
+    def describe_mismatch(self, item, mismatch_description):
+        # No state is kept between calls, since checkers are shared, so the
+        # value is checked again. Iterators must be described while matched.
+        report = self._evaluate(item)[1]
+        self._describe(self._more_items(item, report), mismatch_description)
+
+    def _describe(self, report, desc):
+        kind = report[0]
+        if kind == 'was':
+            desc.append_text('was ').append_description_of(report[1])
+        elif kind == 'empty':
+            desc.append_text('was an empty sequence')
+        elif kind == 'failed':
+            # Describe why the item failed the matcher. When checked by a
+            # worker, or after checking others, we check it again so stateful
+            # matchers can describe it.
+            more, truncated = report[3:] or ((), False)
+            desc.append_text('item %d ' % report[1])
+            if self.parallelism or more:
+                self.matcher.matches(report[2])
+            self.matcher.describe_mismatch(report[2], desc)
+            for index, value in more:
+                desc.append_text('; item %d ' % index)
+                self.matcher.matches(value)
+                self.matcher.describe_mismatch(value, desc)
+            self._describe_truncated(truncated, desc)
+        elif kind == 'matched':
+            more, truncated = report[3:] or ((), False)
+            desc.append_text('item %d was ' % report[1]) \
+                .append_description_of(report[2])
+            for index, value in more:
+                desc.append_text('; item %d was ' % index).append_description_of(value)
+            self._describe_truncated(truncated, desc)
+        elif kind == 'missing':
+            _, count, firsts = report
+            desc.append_text('no item matched in %d items' % count)
+            if firsts:
+                desc.append_list(' starting with ', ', ', '', firsts)
+        elif kind == 'indices':
+            _, indices, values, total = report
+            desc.append_text('items at indices %s' % indices)
+            if total > len(indices):
+                desc.append_text(' (and %d more)' % (total - len(indices)))
+            desc.append_list(' were ', ', ', '', values)
+
+    def _describe_truncated(self, truncated, desc):
+        if truncated:
+            desc.append_text(' (only the first %d items are reported)'
+                             % description.current().max_failures)
+
+    def _indices_report(self, indices, array):
+        shown = [int(i) for i in indices[:description.current().max_failures]]
+        return ('indices', shown, array[shown].tolist(), len(indices))
+
+
+class EveryItem(Quantifier):
+    """ Matches if all the items pass the matcher. Empty iterables do not match. """
+
+    stops_on = False
+
+    def _item_outcome(self, index, value):
+        return False, ('failed', index, value)
+
+    def _decisive(self, result):
+        return not result
+
+    def _exhausted(self, count, firsts):
+        if not count:
+            return False, ('empty',)
+        return True, None
+
+    def _decide(self, mask, array):
+        if not len(mask):
+            return False, ('empty',)
+        failed = vectorized.numpy.flatnonzero(~mask)
+        return not len(failed), self._indices_report(failed, array)
+
+    def describe_to(self, desc):
+        desc.append_text('a sequence containing items matching ') \
+            .append_description_of(self.matcher)
+
+
+class SomeItem(Quantifier):
+    """ Matches if at least one of the items passes the matcher """
+
+    stops_on = True
+
+    def _item_outcome(self, index, value):
+        return True, None
+
+    def _decisive(self, result):
+        return result
+
+    def _exhausted(self, count, firsts):
+        return False, ('missing', count, firsts)
+
+    def _decide(self, mask, array):
+        return bool(mask.any()), ('missing', len(array), array[:description.current().max_failures].tolist())
+
+    def describe_to(self, desc):
+        desc.append_text('a sequence containing ') \
+            .append_description_of(self.matcher)
+
+
+class NoItem(Quantifier):
+    """ Matches if none of the items passes the matcher """
+
+    stops_on = True
+
+    def _item_outcome(self, index, value):
+        return False, ('matched', index, value)
+
+    def _decisive(self, result):
+        return not result
+
+    def _exhausted(self, count, firsts):
+        return True, None
+
+    def _decide(self, mask, array):
+        matched = vectorized.numpy.flatnonzero(mask)
+        return not len(matched), self._indices_report(matched, array)
+
+    def _evaluate(self, item):
+        result, report = super(NoItem, self)._evaluate(item)
+        # Not being iterable means it does not contain anything
+        if report is not None and report[0] == 'was':
+            return True, None
+        return result, report
+
+    def describe_to(self, desc):
+        desc.append_text('not a sequence containing ') \
+            .append_description_of(self.matcher)
@@ -0,0 +1,155 @@
+"""
+Evaluates matcher trees against NumPy arrays as boolean masks, so quantified
+expectations over large arrays avoid calling the matchers once per item.
+NumPy is an optional dependency, it's only used once imported by someone else
+since otherwise no value can be an array.
+"""
+import sys
+import operator
+
+from hamcrest.core.core.isequal import IsEqual
+from hamcrest.core.core.isnot import IsNot
+from hamcrest.core.core.allof import AllOf
+from hamcrest.core.core.anyof import AnyOf
+from hamcrest.core.core.isanything import IsAnything
+from hamcrest.core.core.isinstanceof import IsInstanceOf
+from hamcrest.library.collection.isin import IsIn
+from hamcrest.library.number.iscloseto import IsCloseTo
+from hamcrest.library.number.ordering_comparison import OrderingComparison
+
+from .catalogue import TypeMatcher
+
+# Bound when the first array is found
+numpy = None
+
+__author__ = "Ivan -DrSlump- Montes"
+__email__ = "drslump@pollinimini.net"
+__license__ = "MIT"
+
+
+# Scalar types we can safely broadcast against an array
+SCALAR_TYPES = (int, float, complex, bool, bytes, str)
+
+COMPARISONS = (operator.eq, operator.ne, operator.lt, operator.le,
+               operator.gt, operator.ge)
+
+
+def is_array(value):
+    """ Checks if the value is a one dimensional NumPy array. Iterating other
+        arrays yields sub-arrays, which we leave to the standard matchers.
+    """
+    global numpy
+    if numpy is None:
+        numpy = sys.modules.get('numpy')
+        if numpy is None:
+            return False
+
+    return isinstance(value, numpy.ndarray) and value.ndim == 1
+
+
+def _is_scalar(value):
+    return isinstance(value, SCALAR_TYPES) or isinstance(value, numpy.generic)
+
+
+def _comparable(array, values):
+    """ Checks if the values are of the same kind as the items, otherwise
+        numpy would coerce them to a common dtype (ie: numbers to strings)
+        and compare them differently than the items one by one.
+    """
+    kind = array.dtype.kind
+    if kind in 'biufc':
+        types = (int, float, complex, numpy.number, numpy.bool_)
+    elif kind == 'U':
+        types = str
+    elif kind == 'S':
+        types = bytes
+    else:
+        return False
+    return all(isinstance(v, types) for v in values)
+
+
+def _as_mask(result, array):
+    """ Validates the result of a vectorized operation """
+    if (isinstance(result, numpy.ndarray) and result.dtype == numpy.bool_
+            and result.shape == array.shape):
+        return result
+    return None
+
+
+def _filled(array, value):
+    return numpy.full(array.shape, bool(value), dtype=numpy.bool_)
+
+
+def _type_mask(array, types):
+    """ Mirrors isinstance on the items, which for arrays other than object
+        ones are scalars of the dtype (ie: numpy.int64 is not an int but
+        numpy.float64 is a float).
+    """
+    if array.dtype.kind == 'O':
+        return numpy.fromiter((isinstance(x, types) for x in array),
+                              dtype=numpy.bool_, count=len(array))
+    return _filled(array, issubclass(array.dtype.type, types))
+
+
+def mask(matcher, array):
+    """ Obtains a boolean mask with the items of the array matched by the
+        matcher, or None if the matcher tree cannot be vectorized.
+    """
+    try:
+        return _mask(matcher, array)
+    except (TypeError, ValueError):
+        return None
+
+
+def _mask(matcher, array):
+    if isinstance(matcher, (AllOf, AnyOf)):
+        masks = [_mask(m, array) for m in matcher.matchers]
+        if any(m is None for m in masks):
+            return None
+        reducer = numpy.logical_and if isinstance(matcher, AllOf) else numpy.logical_or
+        return reducer.reduce(masks)
+
+    if isinstance(matcher, IsNot):
+        inner = _mask(matcher.matcher, array)
+        return None if inner is None else ~inner
+
+    if isinstance(matcher, IsAnything):
+        return _filled(array, True)
+
+    if isinstance(matcher, IsEqual):
+        if not _is_scalar(matcher.object):
+            return None
+        return _as_mask(array == matcher.object, array)
+
+    if isinstance(matcher, OrderingComparison):
+        if (matcher.comparison_function not in COMPARISONS
+                or not _is_scalar(matcher.value)):
+            return None
+        return _as_mask(matcher.comparison_function(array, matcher.value), array)
+
+    if isinstance(matcher, IsCloseTo):
+        if array.dtype.kind not in 'iufc':
+            return None
+        # Subtracting in the array dtype would wrap around for unsigned ints
+        dtype = complex if array.dtype.kind == 'c' else float
+        difference = numpy.subtract(array, matcher.value, dtype=dtype)
+        return _as_mask(numpy.abs(difference) <= matcher.delta, array)
+
+    if isinstance(matcher, IsIn):
+        values = list(matcher.sequence)
+        if not _comparable(array, values):
+            return None
+        return _as_mask(numpy.isin(array, values), array)
+
+    if isinstance(matcher, IsInstanceOf):
+        expected = matcher.expected_type
+        if (isinstance(expected, type) and issubclass(expected, numpy.generic)
+                and array.dtype.kind != 'O'):
+            return _filled(array, numpy.issubdtype(array.dtype, expected))
+        return _type_mask(array, expected)
+
+    if isinstance(matcher, TypeMatcher):
+        cls = matcher.__class__
+        return _type_mask(array, cls.types)
+
+    return None
@@ -9,8 +9,9 @@ setup(
     author_email='drslump@pollinimini.net',
     packages=find_packages(),
     include_package_data=True,
+    python_requires='>=3.7',
     install_requires=['pyhamcrest'],
-    tests_require=['nose','pyhamcrest'],
-    test_suite="nose.collector",
+    tests_require=['pyhamcrest'],
+    test_suite='tests',
     zip_safe=False,
     )
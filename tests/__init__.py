@@ -3,6 +3,13 @@ import unittest
 from .dsl import DslTestCase
 from .coordination import CoordinationTestCase
 from .expect import ExpectTestCase
+from .quantifiers import StreamingTestCase, ParallelTestCase, VectorizedTestCase
+from .aio import AioTestCase, AioQuantifiersTestCase
+from .bench import BenchTestCase
+from .instrument import InstrumentTestCase
+from .description import DescriptionTestCase
+from .diff import DiffTestCase
+from .deep import DeepEqualTestCase
 from .patch import PatchTestCase
 
 
@@ -12,4 +19,14 @@ def all_tests():
     suite.addTest(unittest.makeSuite(CoordinationTestCase))
     suite.addTest(unittest.makeSuite(ExpectTestCase))
     suite.addTest(unittest.makeSuite(PatchTestCase))
+    suite.addTest(unittest.makeSuite(StreamingTestCase))
+    suite.addTest(unittest.makeSuite(ParallelTestCase))
+    suite.addTest(unittest.makeSuite(VectorizedTestCase))
+    suite.addTest(unittest.makeSuite(AioTestCase))
+    suite.addTest(unittest.makeSuite(AioQuantifiersTestCase))
+    suite.addTest(unittest.makeSuite(BenchTestCase))
+    suite.addTest(unittest.makeSuite(InstrumentTestCase))
+    suite.addTest(unittest.makeSuite(DescriptionTestCase))
+    suite.addTest(unittest.makeSuite(DiffTestCase))
+    suite.addTest(unittest.makeSuite(DeepEqualTestCase))
     return suite
@@ -0,0 +1,233 @@
+import asyncio
+import unittest
+from pyshould import *
+
+
+async def delayed(value, delay=0.01):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def is_positive(value):
+    await asyncio.sleep(0.01)
+    return value > 0
+
+
+class AioTestCase(unittest.TestCase):
+    """ Tests for the asyncio support """
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_awaitable_subject(self):
+        async def test():
+            await (delayed(1) | should.eq(1))
+            await (it(delayed(1)) | should.be_int)
+            with self.assertRaises(AssertionError):
+                await (delayed(1) | should.eq(2))
+        self.run_async(test())
+
+    def test_awaitable_outside_loop(self):
+        loop = asyncio.new_event_loop()
+        try:
+            future = loop.create_future()
+            future | should.be_an_instance_of(asyncio.Future)
+            self.assertRaises(AssertionError, lambda: future | should.be_none)
+        finally:
+            loop.close()
+
+    def test_async_callback(self):
+        async def test():
+            await (delayed(1) | should.pass_callback(is_positive))
+            await should.pass_callback(is_positive).resolve_async(2)
+            with self.assertRaises(AssertionError):
+                await (delayed(-1) | should.pass_callback(is_positive))
+        self.run_async(test())
+
+    def test_async_callback_deferred(self):
+        async def test():
+            await (5 | should.pass_callback(is_positive))
+            await ([1, 2] | should_all.be_int.and_pass_callback(is_positive))
+            with self.assertRaises(AssertionError):
+                await (-5 | should.pass_callback(is_positive))
+        self.run_async(test())
+
+    def test_not_awaited(self):
+        import gc
+        import warnings
+
+        async def test():
+            delayed(1) | should.eq(2)
+            5 | should.pass_callback(is_positive)
+            gc.collect()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.run_async(test())
+        messages = [str(w.message) for w in caught if w.category is RuntimeWarning]
+        messages | should.contain_the_item(
+            'Expectation never awaited so it was not checked. '
+            'Use: await (<value> | should.<matcher>)')
+        [m for m in messages if m.startswith('Expectation')] | should.have_len(2)
+
+    def test_async_callback_outside_loop(self):
+        1 | should.pass_callback(is_positive)
+        self.assertRaises(AssertionError, lambda: 0 | should.pass_callback(is_positive))
+
+    def test_async_callback_blocking_loop(self):
+        async def test():
+            # Only the pipe operator can defer the resolution
+            with self.assertRaises(AssertionError) as ctx:
+                it(1).pass_callback(is_positive)
+            str(ctx.exception) | should.contain_the_substring('Use: await')
+        self.run_async(test())
+
+    def test_concurrent_resolution(self):
+        async def test():
+            await asyncio.gather(*[
+                delayed(i, 0.05) | should.pass_callback(is_positive)
+                for i in range(1, 20)
+            ])
+        self.run_async(test())
+
+    def test_async_with(self):
+        async def test():
+            async with should.throw(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.sleep(1), 0.01)
+
+            async with should.not_throw:
+                await asyncio.sleep(0)
+
+            with self.assertRaises(AssertionError):
+                async with should.throw(KeyError):
+                    await asyncio.sleep(0)
+        self.run_async(test())
+
+    def test_async_with_interleaved(self):
+        async def block(expected, delay):
+            async with should.throw(expected):
+                await asyncio.sleep(delay)
+                raise expected()
+
+        async def test():
+            # The first task to enter is the last one to exit
+            await asyncio.gather(block(KeyError, 0.05), block(ValueError, 0.01),
+                                 block(TypeError, 0.03))
+        self.run_async(test())
+
+
+async def produce(items, consumed=None, delay=0):
+    for item in items:
+        if consumed is not None:
+            consumed.append(item)
+        await asyncio.sleep(delay)
+        yield item
+
+
+class AioQuantifiersTestCase(unittest.TestCase):
+    """ Tests for the quantified expectations over async iterables """
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_all(self):
+        async def test():
+            await (produce([1, 2, 3]) | should_all.be_int)
+            await (produce([1, 2, 3]) | should_all.pass_callback(is_positive))
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce([1, -2, 3, -4]) | should_all.pass_callback(is_positive))
+            str(ctx.exception) | should.contain_the_substring('item 1 returned False')
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce([]) | should_all.be_int)
+            str(ctx.exception) | should.contain_the_substring('empty')
+        self.run_async(test())
+
+    def test_any(self):
+        async def test():
+            await (produce([-1, 0, 3]) | should_any.pass_callback(is_positive))
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce([-1, -2]) | should_any.pass_callback(is_positive))
+            str(ctx.exception) | should.contain_the_substring('no item matched in 2 items')
+        self.run_async(test())
+
+    def test_none(self):
+        async def test():
+            await (produce([-1, 0]) | should_none.pass_callback(is_positive))
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce([-1, 5, 6]) | should_none.be_gt(0))
+            str(ctx.exception) | should.contain_the_substring('item 1 was <5>')
+        self.run_async(test())
+
+    def test_logical_and_transform(self):
+        async def test():
+            await (produce([1, 2]) | should_all.be_int.and_pass_callback(is_positive))
+            await (produce(['a', 'bc']) | should_all(len).be_gt(0))
+            with self.assertRaises(AssertionError):
+                await (produce([1, 2]) | should_all.not_pass_callback(is_positive))
+        self.run_async(test())
+
+    def test_short_circuit(self):
+        consumed = []
+
+        async def test():
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce(range(1000), consumed) | should_all.be_lt(10))
+            str(ctx.exception) | should.contain_the_substring('item 10 ')
+        self.run_async(test())
+        len(consumed) | should.be_lt(100)
+
+    def test_cancels_pending(self):
+        started = []
+        cancelled = []
+
+        async def slow(value):
+            started.append(value)
+            try:
+                await asyncio.sleep(0.05 if value == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(value)
+                raise
+            return value > 0
+
+        async def test():
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce(range(5)) | should_all.pass_callback(slow))
+            str(ctx.exception) | should.contain_the_substring('item 0 ')
+        self.run_async(test())
+        cancelled | should.eq([1, 2, 3, 4])
+
+    def test_bounded_concurrency(self):
+        state = {'running': 0, 'peak': 0}
+
+        async def tracked(value):
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            await asyncio.sleep(0.01)
+            state['running'] -= 1
+            return True
+
+        async def test():
+            await (produce(range(40)) | should_all.parallel(4).pass_callback(tracked))
+            state['peak'] | should.eq(4)
+            await (produce(range(40)) | should_all.pass_callback(tracked))
+            state['peak'] | should.be_gt(4)
+        self.run_async(test())
+
+    def test_scales_with_concurrency(self):
+        async def test():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await (produce(range(100)) | should_all.parallel(100).pass_callback(is_positive)
+                   .or_eq(0))
+            (loop.time() - start) | should.be_lt(0.5)
+        self.run_async(test())
+
+    def test_errors(self):
+        async def failing(value):
+            raise AssertionError('boom')
+
+        async def test():
+            with self.assertRaises(AssertionError) as ctx:
+                await (produce([1]) | should_all.pass_callback(failing))
+            str(ctx.exception) | should.eq('boom')
+        self.run_async(test())
@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pyshould import *
+from pyshould import bench
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+class BenchTestCase(unittest.TestCase):
+    """ Tests for the benchmarks runner """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.baseline = os.path.join(self.tmpdir, 'baseline.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_registered(self):
+        names = [name for name, _ in bench.BENCHMARKS]
+        names | should.contain_the_items('getattr', 'lookup', 'normalize',
+                                         'evaluate_chain', 'pipe', 'quantifier_list',
+                                         'eq_mock', 'patched')
+
+    def test_run_pattern(self):
+        out = StringIO()
+        results = bench.run('normalize', repeat=1, out=out)
+        list(results) | should.eq(['normalize'])
+        results['normalize'] | should.be_greater_than(0)
+        out.getvalue() | should.start_with('normalize')
+
+    def test_isolated(self):
+        patched = 'pyshould.patch' in sys.modules
+        results = bench.run('patched', repeat=1)
+        results['patched'] | should.be_greater_than(0)
+        ('pyshould.patch' in sys.modules) | should.eq(patched)
+
+    def test_measure_warms_up(self):
+        calls = []
+
+        def fn():
+            # Only the first call is slow, like a lazy import
+            if not calls:
+                time.sleep(0.3)
+            calls.append(1)
+
+        bench.measure(fn, repeat=1) | should.be_less_than(1e8)
+
+    def test_save_and_load(self):
+        bench.save({'pipe': 100.0}, self.baseline)
+        bench.load(self.baseline) | should.eq({'pipe': 100.0})
+
+        with open(self.baseline, 'w') as fd:
+            json.dump({'format': 0, 'results': {}}, fd)
+        self.assertRaises(ValueError, bench.load, self.baseline)
+
+    def test_compare(self):
+        baseline = {'pipe': 100.0, 'lookup': 100.0, 'gone': 1.0}
+        results = {'pipe': 119.0, 'lookup': 121.0, 'new': 1000.0}
+        bench.compare(results, baseline) | should.eq([('lookup', 100.0, 121.0)])
+        bench.compare(results, baseline, 0.1) | should.have_len(2)
+
+    def test_main(self):
+        out = StringIO()
+        bench.main(['-k', 'normalize', '--repeat', '1', '--save', self.baseline],
+                   out=out) | should.eq(0)
+        bench.load(self.baseline) | should.have_key('normalize')
+
+        # Make the baseline impossibly fast to force a regression
+        bench.save({'normalize': 0.001}, self.baseline)
+        out = StringIO()
+        bench.main(['-k', 'normalize', '--repeat', '1', '--compare', self.baseline],
+                   out=out) | should.eq(1)
+        out.getvalue() | should.contain_the_substring('REGRESSION normalize')
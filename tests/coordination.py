@@ -104,3 +104,16 @@ class CoordinationTestCase(unittest.TestCase):
 
         ex = ex.less_than(1).And(3)
         ex.resolve(0)
+
+    def test_parsed_names_cache(self):
+        from pyshould import expectation
+
+        ex = Expectation(deferred=True)
+        for _ in range(2):
+            ex = ex.less_than(3).and_not_equal(2)
+            ex.resolve(1)
+            ex = ex.less_than(3).and_not_equal(2)
+            self.assertRaises(AssertionError, lambda: ex.resolve(2))
+
+        self.assertEqual(expectation._parsed_names['and_not_equal'],
+                         (OPERATOR.AND, True, 'equal'))
@@ -0,0 +1,131 @@
+from pyshould import *
+from pyshould import deep
+from .helpers import FailureTestCase
+
+
+class DeepEqualTestCase(FailureTestCase):
+    """ Tests for the structural comparison of nested values """
+
+    expected = {
+        'items': [{'id': 1, 'price': 3.0, 'tags': ['a']},
+                  {'id': 2, 'price': 4.5, 'tags': ['b']}],
+        'meta': {'ts': 100, 'next page': None},
+    }
+
+    def payload(self):
+        return {
+            'items': [{'id': 1, 'price': 3.0, 'tags': ['a']},
+                      {'id': 2, 'price': 4.5, 'tags': ['b']}],
+            'meta': {'ts': 100, 'next page': None},
+        }
+
+    def test_parse(self):
+        deep.parse('$.items[42].price') | should.eq(('items', 42, 'price'))
+        deep.parse('$..id') | should.eq(('**', 'id'))
+        deep.parse("$['next page'][*]") | should.eq(('next page', '*'))
+        deep.parse('items.**.id') | should.eq(('items', '**', 'id'))
+        self.assertRaises(ValueError, deep.parse, '$.items[')
+
+    def test_render(self):
+        deep.render(None) | should.eq('$')
+        deep.render(((((None, 'items'), 42), 'price'))) | should.eq('$.items[42].price')
+        deep.render(((None, 'next page'), 1)) | should.eq("$['next page'][1]")
+
+    def test_equal(self):
+        self.payload() | should.deep_equal(self.expected)
+        self.payload() | should.be_deeply_equal_to(self.expected)
+        [1, (2, 3)] | should_not.deep_equal([1, [2, 3]])
+
+    def test_first_difference(self):
+        payload = self.payload()
+        payload['items'][1]['price'] = 5.0
+        payload['meta']['ts'] = 200
+        message = self.assertFailure(lambda: payload | should.deep_equal(self.expected),
+                                     'but: $.items[1].price was <5.0> instead of <4.5>\n')
+        message | should_not.contain_the_substring('$.meta.ts')
+
+    def test_max_differences(self):
+        payload = self.payload()
+        payload['items'][0]['tags'].append('c')
+        del payload['items'][1]['id']
+        payload['meta']['extra'] = True
+        self.assertFailure(lambda: payload | should.deep_equal(self.expected, max_differences=5),
+                           'but: $.items[0].tags had 2 items instead of 1; '
+                           '$.items[1].id was missing; '
+                           '$.meta.extra was not expected: <True>\n')
+
+    def test_ignore(self):
+        payload = self.payload()
+        payload['meta']['ts'] = 200
+        payload['items'][1]['id'] = 20
+        payload | should.deep_equal(self.expected, ignore=['$.meta.ts', '$..id'])
+        payload | should_not.deep_equal(self.expected, ignore=['$.meta.ts', '$.items[0].id'])
+        payload | should.deep_equal(self.expected, ignore=['$.meta', '$.items[*].id'])
+
+    def test_tolerance(self):
+        payload = self.payload()
+        payload['items'][0]['price'] = 3.001
+        payload | should.deep_equal(self.expected, tolerance=0.01)
+        payload | should.deep_equal(self.expected, tolerance={'$.items[*].price': 0.01})
+        self.assertFailure(
+            lambda: payload | should.deep_equal(self.expected, tolerance={'$.meta.ts': 0.01}),
+            '$.items[0].price was <3.001> instead of <3.0>')
+
+    def test_tolerance_lengths(self):
+        should.deep_equal([1, 2, 3], tolerance=5).matches([1, 2, 3, 4, 5]) | should.be_false
+        should.deep_equal({'a': [1]}, tolerance={'$.a': 3}).matches({'a': [1, 2]}) | should.be_false
+        self.assertFailure(lambda: [1, 2.01] | should.deep_equal([1, 2, 3], tolerance=0.1),
+                           'but: $ had 2 items instead of 3')
+
+    def test_cycles(self):
+        expected = {'name': 'root', 'children': []}
+        expected['children'].append(expected)
+        actual = {'name': 'root', 'children': []}
+        actual['children'].append(actual)
+        actual | should.deep_equal(expected)
+
+        actual['name'] = 'other'
+        self.assertFailure(lambda: actual | should.deep_equal(expected),
+                           "$.name was 'other' instead of 'root'")
+
+    def test_deep_nesting(self):
+        expected, actual = [0], [1]
+        for _ in range(10000):
+            expected, actual = [expected], [actual]
+        self.assertFailure(lambda: actual | should.deep_equal(expected),
+                           '$' + '[0]' * 10 + '[0]')
+
+    def test_long_sequences(self):
+        expected = list(range(100000))
+        actual = expected[:]
+        actual[70000] = -1
+        self.assertFailure(lambda: actual | should.deep_equal(expected),
+                           'but: $[70000] was <-1> instead of <70000>')
+
+    def test_shared_checker(self):
+        import sys
+        import threading
+        checker = should.deep_equal({'a': {'b': 1}}).compile()
+        messages = []
+
+        def run(value):
+            for _ in range(50):
+                try:
+                    {'a': {'b': value}} | checker
+                except AssertionError as ex:
+                    messages.append((value, str(ex)))
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(2, 8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        messages | should.have_len(300)
+        for value, message in messages:
+            message | should.contain_the_substring('$.a.b was <%d> instead of <1>' % value)
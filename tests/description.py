@@ -0,0 +1,86 @@
+from pyshould import *
+from pyshould import description
+from pyshould.description import Budget, BoundedDescription
+from .helpers import FailureTestCase
+
+
+class DescriptionTestCase(FailureTestCase):
+    """ Tests for the bounded descriptions of mismatches """
+
+    def test_items_and_depth(self):
+        desc = BoundedDescription(Budget(max_items=3, max_depth=2))
+        desc.append_description_of(list(range(100)))
+        str(desc) | should.eq('<[0, 1, 2, ...]>')
+
+        desc = BoundedDescription(Budget(max_items=3, max_depth=2))
+        desc.append_description_of({'b': [[1]], 'a': set([3, 2, 1, 0])})
+        str(desc) | should.eq("<{'a': {0, 1, 2, ...}, 'b': [[...]]}>")
+
+    def test_characters(self):
+        desc = BoundedDescription(Budget(max_chars=20))
+        desc.append_text('was ').append_description_of('x' * 100)
+        desc.append_text(' and more')
+        str(desc) | should.eq("was 'xxxxxxx...xxxxx" + description.TRUNCATED)
+
+    def test_bytes(self):
+        desc = BoundedDescription(Budget(max_chars=20))
+        desc.append_description_of(b'\x00' * 10 ** 7)
+        str(desc) | should.eq("<b'\\x00\\x...\\x00\\x00" + description.TRUNCATED)
+
+        desc = BoundedDescription(Budget(max_chars=60))
+        desc.append_description_of([bytearray(b'ab' * 10 ** 7)])
+        str(desc) | should.start_with("<[bytearray(b'abab").and_contain_the_substring('...')
+        len(str(desc)) | should.be_less_than(80)
+
+    def test_huge_subject(self):
+        values = list(range(100000))
+        message = self.assertFailure(lambda: values | should.have_len(3),
+                                     'was <[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, '
+                                     '17, 18, 19, ...]> with length of <100000>')
+        len(message) | should.be_less_than(300)
+
+    def test_limits(self):
+        with description.limits(max_items=2) as budget:
+            budget.max_items | should.eq(2)
+            self.assertFailure(lambda: [1, 2, 3] | should.have_len(1), 'was <[1, 2, ...]>')
+        description.budget.max_items | should.eq(20)
+
+        self.assertRaises(TypeError, lambda: description.configure(max_lines=2))
+
+    def test_limits_threads(self):
+        import threading
+        barrier = threading.Barrier(2)
+        seen = []
+
+        def worker(items):
+            with description.limits(max_items=items):
+                # Both blocks are entered before any of them checks its budget
+                barrier.wait()
+                seen.append((items, description.current().max_items))
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in (2, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sorted(seen) | should.eq([(2, 2), (3, 3)])
+        description.current() | should.be(description.budget)
+
+    def test_quantifier_failures(self):
+        values = ['a'] + list(range(10)) + ['b', 'c']
+        self.assertFailure(lambda: values | should_all.be_int,
+                           "item 0 was a str 'a'; item 11 was a str 'b'; item 12 was a str 'c'")
+        self.assertFailure(lambda: values | should_none.be_a_string,
+                           "item 0 was 'a'; item 11 was 'b'; item 12 was 'c'")
+
+        with description.limits(max_failures=2):
+            message = self.assertFailure(lambda: values | should_all.be_int,
+                                         "item 0 was a str 'a'; item 11 was a str 'b' "
+                                         "(only the first 2 items are reported)")
+            message | should_not.contain_the_substring("'c'")
+
+        # Iterators can only be consumed once, so they stop at the first one
+        self.assertFailure(lambda: iter(values) | should_all.be_int,
+                           "item 0 was a str 'a'\n")
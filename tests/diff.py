@@ -0,0 +1,85 @@
+from pyshould import *
+from pyshould import diff
+from .helpers import FailureTestCase
+
+
+class DiffTestCase(FailureTestCase):
+    """ Tests for the differences described by the equality matchers """
+
+    def test_common_prefix_and_suffix(self):
+        a = 'x' * 5000 + 'abc' + 'y' * 3000
+        b = 'x' * 5000 + 'adc' + 'y' * 3000
+        diff.common_prefix(a, b) | should.eq(5001)
+        diff.common_suffix(a, b, 5001) | should.eq(3001)
+        diff.common_prefix(a, a[:100]) | should.eq(100)
+        diff.common_suffix('aaa', 'aa', 2) | should.eq(0)
+
+    def test_myers(self):
+        diff.myers('abcabba', 'cbabac') | should.have_len(5)
+        diff.myers('abc', 'abc') | should.eq([])
+        diff.myers('abc', 'xyz', max_edits=5) | should.be_none()
+        diff.myers([1, 2, 3], [1, 3, 4]) | should.eq([('-', 1, 1), ('+', 3, 2)])
+
+    def test_hunks(self):
+        result = diff.Diff('the quick brown fox', 'the quack brown fix')
+        result.start | should.eq(6)
+        result.hunks | should.eq([(6, 7, 6, 7), (17, 18, 17, 18)])
+
+    def test_too_many_edits(self):
+        result = diff.Diff('a' * 100 + 'b' * 200, 'a' * 100 + 'c' * 200)
+        result.start | should.eq(100)
+        result.hunks | should.be_none()
+
+    def test_string(self):
+        expected = 'lorem ipsum dolor sit amet\n' * 1000
+        actual = expected[:5400] + 'lorem ipsum dolor sat amet' + expected[5426:]
+        message = self.assertFailure(lambda: actual | should.eq(expected),
+                                     'but: differs at index 5419 (line 201, column 20)\n'
+                                     '          ...\\nlorem ipsum dolor s[-i-]{+a+}t amet\\nlorem ipsum d...\n'
+                                     "          was 'lorem ipsum")
+        self.assertLess(len(message), 10000)
+
+    def test_long_expected(self):
+        expected = 'x' * 100000
+        self.assertFailure(lambda: expected + 'y' | should.eq(expected),
+                           'differs at index 100000')
+
+    def test_bytes(self):
+        expected = b'\x00' * 100 + b'abc'
+        self.assertFailure(lambda: expected[:-1] | should.eq(expected),
+                           'differs at index 102\n          ...' + '\\x00' * 18 + 'ab[-c-]\n')
+
+    def test_sequence(self):
+        expected = list(range(100))
+        actual = expected[:50] + ['x'] + expected[51:] + [100]
+        self.assertFailure(lambda: actual | should.eq(expected),
+                           'but: differs at index 50\n'
+                           "          - [50] <50>\n"
+                           "          + [50] 'x'\n"
+                           "          + [100] <100>\n"
+                           '          was <[0, 1, 2')
+
+    def test_short_values(self):
+        self.assertFailure(lambda: 'abc' | should.eq('abd'),
+                           "but: was 'abc'\n")
+        self.assertFailure(lambda: [1] | should.eq((1,)),
+                           'but: was <[1]>\n')
+        self.assertFailure(lambda: 'x' * 50 | should.eq(list('x' * 50)),
+                           "but: was 'xxx")
+
+    def test_mixed_sequence_types(self):
+        self.assertFailure(lambda: tuple(range(40)) | should.eq(list(range(40))),
+                           'but: was <(0, 1, 2')
+        self.assertFailure(lambda: (1,) * 40 | should.eq([1] * 40),
+                           'but: was <(1, 1, 1')
+        diff.common_prefix((1,) * 40, [1] * 40) | should.eq(40)
+        diff.common_suffix((1,) * 40, [1] * 40) | should.eq(40)
+
+    def test_clipped_window(self):
+        expected = list(range(10000))
+        actual = [-1] + expected[1:5000] + expected[5001:]
+        self.assertFailure(lambda: actual | should.eq(expected),
+                           'differs at index 0, showing the edits in the next 1024 items\n'
+                           '          - [0] <0>\n'
+                           '          + [0] <-1>\n'
+                           '          was')
@@ -135,6 +135,47 @@ class DslTestCase(unittest.TestCase):
             object = {}
             object['non-existing-key']
 
+    def test_context_manager_threads(self):
+        import threading
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def worker(expected, other):
+            try:
+                with should.throw(expected):
+                    # Both blocks are entered before any of them exits
+                    barrier.wait()
+                    raise expected()
+                with should.throw(other):
+                    barrier.wait()
+                    raise other()
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=worker, args=(KeyError, ValueError)),
+                   threading.Thread(target=worker, args=(ValueError, KeyError))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        errors | should.be_empty
+
+    def test_context_manager_nested(self):
+        with should.throw(KeyError):
+            with should.throw(ValueError):
+                raise ValueError()
+            raise KeyError()
+
+        def inner_failure():
+            with should.throw(KeyError):
+                with should.throw(ValueError):
+                    raise KeyError()
+        self.assertRaisesRegexp(AssertionError, 'ValueError', inner_failure)
+
+        from pyshould.expectation import _contexts
+        _contexts.get() | should.be_empty
+
     def test_match(self):
         "foo" | should.match('^\w+$')
 
@@ -147,6 +188,75 @@ class DslTestCase(unittest.TestCase):
             lambda: 10 | should.match('^\d+')
         )
 
+    def test_match_bytes(self):
+        b"foo" | should.match(r'^\w+$')
+        bytearray(b"foo") | should.match(r'o+')
+        memoryview(b"foo") | should.match(b'^f')
+        "foo" | should.match(b'^f')
+
+    def test_match_variants(self):
+        "foo bar" | should.match_at_start('foo')
+        "foo bar" | should_not.match_at_start('bar')
+        "foo" | should.fullmatch('fo+')
+        "foo bar" | should_not.fullmatch('fo+')
+        with self.assertRaises(AssertionError) as ctx:
+            "foo bar" | should.fully_match('fo+')
+        self.assertIn('fully matching /fo+/', str(ctx.exception))
+
+    def test_match_shared_patterns(self):
+        import re
+        from pyshould.catalogue import RegexMatcher
+        self.assertIs(RegexMatcher('^a+$', 'i').pattern, RegexMatcher('^a+$', re.I).pattern)
+        "AAA" | should.match(re.compile('^a+$', re.I))
+
+    def test_change(self):
+        state = {'items': [1, 2]}
+        append = lambda: state['items'].append(3)
+
+        append | should.change(lambda: state)
+        (state['items'].append, 4) | should.change(state)
+        (lambda: None) | should_not.change(state)
+        with self.assertRaises(AssertionError) as ctx:
+            append | should_not.change(state)
+        self.assertIn('did change from', str(ctx.exception))
+
+    def test_change_snapshots(self):
+        state = {'items': [1, 2], 'name': 'foo'}
+        append = lambda: state['items'].append(3)
+        rename = lambda: state.update(name='bar')
+
+        append | should.change(state, snapshot='fingerprint')
+        append | should_not.change(state, snapshot='shallow')
+        rename | should.change(state, snapshot='shallow')
+        rename | should_not.change(state, snapshot='identity')
+        append | should.change(lambda: state['items'], snapshot=len)
+
+        def replace():
+            state['items'] = list(state['items'])
+        replace | should.change(lambda: state['items'], snapshot='identity')
+
+        with self.assertRaises(AssertionError) as ctx:
+            (lambda: None) | should.change(state, snapshot='fingerprint')
+        self.assertIn("it didn't change from <{'items'", str(ctx.exception))
+
+        self.assertRaises(ValueError, lambda: should.change(state, snapshot='deep'))
+
+    def test_fingerprint(self):
+        from pyshould.catalogue import fingerprint
+        cyclic = [1, lambda: None]
+        cyclic.append(cyclic)
+        self.assertEqual(fingerprint(cyclic), fingerprint(cyclic))
+        self.assertEqual(fingerprint({'a': [1]}), fingerprint({'a': [1]}))
+        self.assertNotEqual(fingerprint({'a': [1]}), fingerprint({'a': [2]}))
+
+        # Equal unordered containers don't depend on their iteration order
+        self.assertEqual(fingerprint({'a': 1, 'b': 2}), fingerprint({'b': 2, 'a': 1}))
+        self.assertEqual(fingerprint({8, 16}), fingerprint({16, 8}))
+        state = {'a': 1, 'b': 2}
+        def reorder():
+            state['a'] = state.pop('a')
+        reorder | should_not.change(lambda: state, snapshot='fingerprint')
+
     def test_callback_matcher(self):
         1 | should.pass_callback(lambda x: x == 1)
 
@@ -253,6 +363,73 @@ class DslTestCase(unittest.TestCase):
                                   added_author=should.be_a_string(),
                                   fake='foo')
 
+    def test_has_props_fetches_only_expected(self):
+        fetched = []
+
+        class Model(object):
+            __slots__ = ('__dict__', 'pk')
+
+            def __init__(self):
+                self.pk = 1
+                self.name = 'foo'
+
+            @property
+            def label(self):
+                fetched.append('label')
+                return self.name.upper()
+
+            @property
+            def lazy(self):
+                raise RuntimeError('lazy loaded')
+
+        Model() | should.have_props(pk=1, name='foo', label='FOO')
+        Model() | should.have_props(label='FOO')
+        fetched | should.eq(['label', 'label'])
+
+        with self.assertRaises(AssertionError) as ctx:
+            Model() | should.have_props(lazy=1)
+        self.assertIn("unable to extract attribute 'lazy'", str(ctx.exception))
+
+        with self.assertRaises(AssertionError) as ctx:
+            Model() | should.have_props(should='x')
+        # Missing attributes are described with all the others, like before
+        self.assertIn('unable to extract attributes from value: lazy loaded',
+                      str(ctx.exception))
+
+        class Plain(object):
+            pk = 1
+
+        with self.assertRaises(AssertionError) as ctx:
+            Plain() | should.have_props(name='foo')
+        self.assertIn("no 'name' key in <{'pk': 1}>", str(ctx.exception))
+
+    def test_has_props_plans_per_type(self):
+        from pyshould.catalogue import IsObjectContainingEntries
+
+        class Base(object):
+            name = 'base'
+
+        class Dynamic(Base):
+            def __getattr__(self, key):
+                return 'dynamic'
+
+        matcher = IsObjectContainingEntries({'name': 'base'})
+        self.assertTrue(matcher.matches(Base()))
+        self.assertTrue(matcher.matches(Dynamic()))
+        self.assertTrue(matcher.matches(Base))
+        self.assertEqual(len(matcher._plans), 3)
+
+        dynamic = Dynamic()
+        dynamic.name = 'own'
+        self.assertFalse(matcher.matches(dynamic))
+        self.assertTrue(IsObjectContainingEntries({'other': 'dynamic'}).matches(dynamic))
+
+        # Plans do not keep the types alive
+        import gc
+        del Dynamic, dynamic
+        gc.collect()
+        self.assertEqual(len(matcher._plans), 2)
+
     def test_has_props_non_class(self):
         d = "fail"
 
@@ -337,6 +514,31 @@ class DslTestCase(unittest.TestCase):
             lambda: self.assertNotEqual(m, 2)
         )
 
+    def test_matches(self):
+        m = should.be_int.and_eq(1)
+        self.assertTrue(m.matches(1))
+        self.assertFalse(m.matches(2))
+        self.assertTrue(m.matches(1))
+
+        self.assertTrue(should_all.be_int.matches([1, 2]))
+        self.assertFalse(should_not.eq(1).matches(1))
+
+    def test_equality_does_not_describe(self):
+        described = []
+
+        class Check(object):
+            def __call__(self, value):
+                return value == 1
+
+            def __str__(self):
+                described.append(True)
+                return 'check'
+
+        m = should.pass_callback(Check())
+        self.assertEqual(1, m)
+        self.assertNotEqual(2, m)
+        described | should.be_empty
+
     def test_equality_exception(self):
         # under the hood the equality for `should` should trigger an error
         (10 == should) | should.be_False
@@ -434,6 +636,210 @@ class DslTestCase(unittest.TestCase):
             "this is foo: 'Foo'",
         ])
 
+    def test_compile(self):
+        checker = should.be_int.and_greater_than(3).compile()
+        checker.check(4)
+        self.assertTrue(checker.matches(5))
+        self.assertFalse(checker.matches(2))
+        self.assertFalse(checker.matches('foo'))
+        self.assertRaises(AssertionError, lambda: checker.check(3))
+        self.assertRaises(AttributeError, lambda: setattr(checker, 'matcher', None))
+
+        10 | checker
+        self.assertEqual(10, checker)
+        self.assertNotEqual(1, checker)
+
+    def test_compile_quantifiers(self):
+        checker = should_all.be_int.compile()
+        checker.check([1, 2])
+        self.assertFalse(checker.matches([1, 'a']))
+
+        checker = should_none.eq(3).compile()
+        checker.check([1, 2])
+        self.assertFalse(checker.matches([1, 3]))
+
+        checker = should.be_int.compile()
+        checker.check(all_of(1, 2))
+        self.assertRaises(AssertionError, lambda: checker.check(any_of('a', 'b')))
+
+    def test_compile_transform(self):
+        import json
+        checker = should_all(json.loads).have_key('bar').compile()
+        checker.check(('{"bar": 10}', '{"bar": 20}'))
+        self.assertFalse(checker.matches(('{"bar": 10}', '{malformed}')))
+
+    def test_compile_without_matchers(self):
+        self.assertRaises(TypeError, lambda: should.compile())
+
+    def test_explain(self):
+        from io import StringIO
+        out = StringIO()
+        plan = should.be_a(dict).and_have_the_key('a').or_be_none.explain(file=out)
+        out.getvalue().splitlines() | should.eq([
+            'OR',
+            '  AND',
+            '    an instance of dict',
+            "    a dictionary containing key 'a'",
+            '  a None',
+        ])
+        plan.analyzed | should.be_false
+
+    def test_explain_analyze(self):
+        from io import StringIO
+        out = StringIO()
+        calls = []
+        expectation = should.be_a(dict).and_have_the_key('a').or_pass_callback(calls.append)
+
+        plan = expectation.explain({'a': 1}, analyze=True, file=out)
+        plan.result | should.be_true
+        plan.root.short_circuits | should.eq(1)
+        plan.root.children[1].evaluations | should.eq(0)
+        calls | should.be_empty
+        out.getvalue() | should.contain_the_substring('[never evaluated]') \
+                       .and_contain_the_substring('Result: matched')
+
+        plan = expectation.explain([], analyze=True, file=StringIO())
+        plan.result | should.be_false
+        and_node = plan.root.children[0]
+        and_node.short_circuits | should.eq(1)
+        and_node.children[1].evaluations | should.eq(0)
+        plan.root.elapsed | should.be_greater_than(0)
+
+    def test_explain_quantifiers(self):
+        from io import StringIO
+        plan = should_all(len).be_gt(1).explain(['aa', 'b', 'cc'], analyze=True,
+                                                file=StringIO())
+        plan.root.label | should.eq('EVERY ITEM')
+        plan.root.evaluations | should.eq(1)
+        plan.root.children[0].evaluations | should.eq(2)
+        plan.result | should.be_false
+
+        plan = should_not.pass_callback(lambda x: 1 / x).explain(0, analyze=True,
+                                                                  file=StringIO())
+        plan.root.label | should.eq('NOT')
+        plan.result | should.be_true
+        self.assertRaises(TypeError, lambda: should.explain())
+
+    def test_explain_described_as(self):
+        from io import StringIO
+        out = StringIO()
+        should.be_an_int.or_be_none.described_as('an id').explain(file=out)
+        out.getvalue().splitlines() | should.eq([
+            "DESCRIBED AS 'an id'",
+            '  OR',
+            '    an integer',
+            '    a None',
+        ])
+
+        plan = should_all.be_an_int.desc('an id').explain(['a'], analyze=True, file=StringIO())
+        plan.root.label | should.eq('EVERY ITEM')
+        plan.root.children[0].label | should.eq("DESCRIBED AS 'an id'")
+        plan.root.children[0].evaluations | should.eq(1)
+        plan.result | should.be_false
+
+    def test_lookup_cache_invalidation(self):
+        from pyshould.matchers import lookup, register, unregister, IsTrue
+
+        self.assertIsNone(lookup('be_a_cached_truth'))
+        register(IsTrue, 'be_a_cached_truth')
+        try:
+            self.assertIs(lookup('be_a_cached_truth'), IsTrue)
+            self.assertIs(lookup('to_be_cached_truth'), IsTrue)
+        finally:
+            unregister('be_a_cached_truth')
+            register(IsTrue, 'be_true')
+
+        self.assertIsNone(lookup('be_a_cached_truth'))
+        self.assertIs(lookup('be_true'), IsTrue)
+
+    def test_lookup_cache_misses(self):
+        from pyshould import matchers
+
+        resolved = matchers._registry.resolved
+        for i in range(100):
+            self.assertFalse(hasattr(should, 'be_an_unknown_thing_%d' % i))
+        self.assertIs(resolved['be_an_unknown_thing_7'], matchers.NOT_FOUND)
+        self.assertIsNone(matchers.lookup('be_an_unknown_thing_7'))
+
+        # Filling it up clears it before resolving a new alias
+        resolved.update(('alias_%d' % i, None) for i in range(matchers.RESOLVED_CACHE_SIZE))
+        self.assertIsNotNone(matchers.lookup('be_an_int'))
+        self.assertEqual(len(resolved), 1)
+
+    def test_unknown_matcher(self):
+        from pyshould.matchers import (
+            MatcherNotFound, register, unregister, suggest, IsTrue)
+
+        self.assertFalse(hasattr(should, 'be_an_unknown_thing'))
+        with self.assertRaises(MatcherNotFound) as ctx:
+            should.be_equl
+        self.assertIsInstance(ctx.exception, KeyError)
+        self.assertIsNone(ctx.exception._message)
+        self.assertIn('Perhaps you meant to use be_equal_to', str(ctx.exception))
+
+        register(IsTrue, 'be_a_suggested_truth')
+        try:
+            self.assertEqual(suggest('be_a_sugested_truth', max=1), ['be_a_suggested_truth'])
+        finally:
+            unregister('be_a_suggested_truth')
+            register(IsTrue, 'be_true')
+        self.assertEqual(suggest('be_a_sugested_truth', max=1, cutoff=0.9), [])
+
+    def test_lazy_imports(self):
+        import os
+        import sys
+        import subprocess
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ('import sys, pyshould; '
+                'print(",".join(m for m in ("hamcrest", "numpy", "pyshould.catalogue") '
+                'if m in sys.modules))')
+        env = dict(os.environ, PYTHONPATH=root)
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(output.strip(), b'')
+
+    def test_registry_snapshots(self):
+        import threading
+        from pyshould import matchers
+        from pyshould.matchers import lookup, register, unregister, IsTrue
+
+        snapshot = matchers._registry
+        register(IsTrue, 'be_a_snapshot_truth')
+        try:
+            self.assertNotIn('be_a_snapshot_truth', snapshot.matchers)
+            self.assertIs(matchers.matchers['be_a_snapshot_truth'], IsTrue)
+
+            def mutate():
+                snapshot.matchers['be'] = IsTrue
+            self.assertRaises(TypeError, mutate)
+        finally:
+            unregister('be_a_snapshot_truth')
+            register(IsTrue, 'be_true')
+
+        # Readers never observe a partially updated registry
+        missing = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                if lookup('be_an_integer') is None:
+                    missing.append(True)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            for i in range(200):
+                register(IsTrue, 'be_stress_truth_%d' % i)
+                unregister('be_stress_truth_%d' % i)
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+            register(IsTrue, 'be_true')
+
+        missing | should.be_empty
+
     def test_contain_sparse_in_order(self):
         with self.assertRaises(AssertionError):
             [1, 4, 3, 3, 3, 6] | should.contain_sparse_in_order(
@@ -472,6 +878,65 @@ class DslTestCase(unittest.TestCase):
             1, should.be_greater_than(7)
         )
 
+    def test_collection_literals(self):
+        from pyshould.catalogue import contains_inanyorder, contains_exactly
+        self.assertIsNotNone(contains_inanyorder(1, 'a', (2, None)).literals)
+        self.assertIsNone(contains_inanyorder(1, [2]).literals)
+        self.assertIsNone(contains_exactly(1, float('nan')).literals)
+        self.assertIsNone(contains_exactly(should.eq(1).evaluate()).literals)
+
+        [3, 1, 2, 1] | should.contain_in_any_order(1, 1, 2, 3)
+        [1, 2] | should_not.contain_in_any_order(1, 2, 2)
+        (1, 2, 3) | should.contain(1, 2, 3)
+        [1, 2, 3] | should_not.contain(1, 2)
+        set([1, 2, 3]) | should.have_the_items(3, 1)
+        [1, 2] | should_not.have_the_items(1, 4)
+        [1, 1, 2] | should.have_only(1, 2)
+        [] | should_not.have_only(1, 2)
+        [True, 1.0] | should.contain_in_any_order(1, 1)
+        # Not hashable items go through the matchers
+        [[1], 2] | should_not.contain_in_any_order(1, 2)
+        [[1], 2] | should.contain([1], 2)
+
+        with self.assertRaises(AssertionError) as ctx:
+            [1, 2] | should.contain_in_any_order(1, 2, 3)
+        self.assertIn('no item matches: <3> in [<1>, <2>]', str(ctx.exception))
+        with self.assertRaises(AssertionError) as ctx:
+            [1, 3, 2] | should.contain(1, 2, 3)
+        self.assertIn('item 1: was <3>', str(ctx.exception))
+
+    def test_contain_sparse_in_order_messages(self):
+        def failure(value, *matchers):
+            with self.assertRaises(AssertionError) as ctx:
+                value | should.contain_sparse_in_order(*matchers)
+            return str(ctx.exception)
+
+        self.assertIn('instead of a a sequence containing a value greater than <7> '
+                      'was <[1, 4, 3]>', failure([1, 4, 3], 1, should.be_greater_than(7)))
+        self.assertIn('Not matched: <9> from candidate list elements: <[1, 8, 9]>',
+                      failure([1, 4, 8, 9], 1, should.be_greater_than(7)))
+        self.assertIn('item 0: was <9> from candidate list elements: <[9, 1]>',
+                      failure([9, 1, 5], 1, should.be_greater_than(7)))
+        self.assertIn('No item matched: <8>', failure([8], should.be_greater_than(7), 8))
+        # Every candidate is reported even if the check stopped before them
+        self.assertIn('item 0: was <8> from candidate list elements: <[8, 1, 9, 1]>',
+                      failure([8, 1, 9, 1], 1, should.be_greater_than(7)))
+        self.assertIn('from candidate list elements: <[8, 1]> that satisfied those '
+                      'conditions from <[8, 1]>',
+                      failure(iter([8, 1]), 1, should.be_greater_than(7)))
+
+    def test_contain_sparse_in_order_stops_early(self):
+        import itertools
+        consumed = []
+
+        def items():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        items() | should_not.contain_sparse_in_order(5, 3)
+        consumed | should.have_len(6)
+
 
 class NonEmptyConstructorException(Exception):
 
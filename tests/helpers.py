@@ -0,0 +1,12 @@
+import unittest
+
+
+class FailureTestCase(unittest.TestCase):
+    """ Base for the tests checking the messages of failed expectations """
+
+    def assertFailure(self, fn, message):
+        """ Checks that calling fn fails with a message containing the given one """
+        with self.assertRaises(AssertionError) as ctx:
+            fn()
+        self.assertIn(message, str(ctx.exception))
+        return str(ctx.exception)
@@ -0,0 +1,113 @@
+import unittest
+from pyshould import *
+from pyshould import instrument
+
+
+class InstrumentTestCase(unittest.TestCase):
+    """ Tests for the instrumentation hooks """
+
+    def setUp(self):
+        self.events = []
+        instrument.subscribe(self.events.append)
+
+    def tearDown(self):
+        instrument.unsubscribe(self.events.append)
+
+    def take(self):
+        # Obtain the events so far, since asserting them emits new ones
+        events = list(self.events)
+        del self.events[:]
+        return events
+
+    def test_subscribe(self):
+        listener = lambda event: None
+        instrument.subscribe(listener) | should.be(listener)
+        instrument.unsubscribe(listener) | should.be_true
+        instrument.unsubscribe(listener) | should.be_false
+
+        with instrument.listening(listener):
+            instrument.listeners | should.contain_the_item(listener)
+        instrument.listeners | should_not.contain_the_item(listener)
+
+    def test_resolve_events(self):
+        1 | should.be_an_int.and_greater_than(0)
+        events = self.take()
+        [e.kind for e in events] | should.eq(['construct', 'lookup', 'lookup',
+                                              'resolve_start', 'resolve_end'])
+
+        end = events[-1]
+        end.aliases | should.eq(('be_an_int', 'greater_than'))
+        end.elapsed | should.be_greater_than(0)
+        end.error | should.be_none
+
+    def test_lookup_events(self):
+        should.be_an_int
+        self.assertRaises(AttributeError, lambda: should.be_an_unknown_matcher)
+        lookups = [e for e in self.take() if e.kind == 'lookup']
+        lookups[0].alias | should.eq('be_an_int')
+        lookups[0].matcher | should.not_be_none
+        lookups[-1].alias | should.eq('be_an_unknown_matcher')
+        lookups[-1].matcher | should.be_none
+
+        # Misses are cached too but still reported without a matcher
+        self.assertRaises(AttributeError, lambda: should.be_an_unknown_matcher)
+        lookups = [e for e in self.take() if e.kind == 'lookup']
+        lookups[-1].cached | should.be_true
+        lookups[-1].matcher | should.be_none
+
+    def test_failure_events(self):
+        with self.assertRaises(AssertionError):
+            'foo' | should.be_an_int
+        events = self.take()
+        [e.kind for e in events[-2:]] | should.eq(['failure', 'resolve_end'])
+        events[-1].error | should.be_an_instance_of(AssertionError)
+
+    def test_other_resolve_paths(self):
+        import asyncio
+
+        async def items():
+            for i in (1, 2, 'x'):
+                yield i
+
+        checker = should.be_an_int.compile()
+        expectation = should_all.be_an_int
+        self.take()
+
+        1 | checker
+        results = [checker.matches('x'), should.be_an_int.matches(1)]
+        with self.assertRaises(AssertionError):
+            asyncio.run(items() | expectation)
+
+        ends = [e for e in self.take() if e.kind in ('failure', 'resolve_end')]
+        results | should.eq([False, True])
+        [e.kind for e in ends] | should.eq(['resolve_end'] * 3 + ['failure', 'resolve_end'])
+        [e.aliases for e in ends] | should_all.eq(('be_an_int',))
+
+    def test_no_tracking_without_listeners(self):
+        instrument.unsubscribe(self.events.append)
+        expectation = should.be_an_int
+        self.assertIsNone(expectation._aliases)
+        self.events | should.be_empty
+
+    def test_alias_counter(self):
+        with instrument.listening(instrument.AliasCounter()) as counter:
+            for i in range(3):
+                i | should.be_an_int
+            self.assertRaises(AssertionError, lambda: 'x' | should.be_an_int)
+            self.assertRaises(AttributeError, lambda: should.be_unknown)
+
+        counter.resolves['be_an_int'] | should.eq(4)
+        counter.failures['be_an_int'] | should.eq(1)
+        counter.misses['be_unknown'] | should.eq(1)
+
+    def test_latency_histogram(self):
+        import time
+        slow = lambda x: time.sleep(0.002) or True
+
+        with instrument.listening(instrument.LatencyHistogram()) as histogram:
+            for i in range(5):
+                i | should.pass_callback(slow)
+
+        histogram.count('pass_callback') | should.eq(5)
+        histogram.percentile('pass_callback', 50) | should.be_greater_than(2000)
+        histogram.percentile('unknown', 50) | should.be_none
@@ -0,0 +1,219 @@
+import unittest
+from pyshould import *
+from .helpers import FailureTestCase
+
+
+def counting(limit, consumed):
+    """ Generates numbers up to limit keeping track of how many were consumed """
+    for i in range(limit):
+        consumed.append(i)
+        yield i
+
+
+def is_positive(value):
+    return value >= 0
+
+
+class StreamingTestCase(FailureTestCase):
+    """ Tests for quantifiers consuming iterators lazily """
+
+    def test_all_stops_at_first_failure(self):
+        consumed = []
+        self.assertFailure(lambda: counting(1000, consumed) | should_all.be_less_than(5),
+                           'item 5 was <5>')
+        consumed | should.have_len(6)
+
+    def test_any_stops_at_first_hit(self):
+        consumed = []
+        counting(1000, consumed) | should_any.eq(3)
+        consumed | should.have_len(4)
+
+        self.assertFailure(lambda: counting(10, []) | should_any.eq(-1),
+                           'no item matched in 10 items starting with <0>, <1>')
+
+    def test_none_stops_at_first_hit(self):
+        consumed = []
+        self.assertFailure(lambda: counting(1000, consumed) | should_none.eq(3),
+                           'item 3 was <3>')
+        consumed | should.have_len(4)
+
+    def test_infinite_iterator(self):
+        import itertools
+        itertools.count() | should_any.be_greater_than(1000)
+
+    def test_empty_and_non_iterables(self):
+        self.assertFailure(lambda: iter([]) | should_all.be_int,
+                           'was an empty sequence')
+        self.assertFailure(lambda: None | should_any.be_int, 'was <None>')
+        None | should_none.be_int
+
+    def test_lazy_transform(self):
+        import json
+        consumed = []
+        items = (json.dumps({'n': i}) for i in counting(1000, consumed))
+        items | should_any(json.loads).have_entry('n', 2)
+        consumed | should.have_len(3)
+
+    def test_more_items_only_described(self):
+        calls = []
+
+        def is_one(value):
+            calls.append(value)
+            return value == 1
+
+        items = [0] + [1] * 1000
+        should_all.pass_callback(is_one).matches(items) | should.be_false()
+        (items == should_all.pass_callback(is_one)) | should.be_false()
+        should_all.pass_callback(is_one).compile().matches(items) | should.be_false()
+        calls | should.have_len(3)
+
+        self.assertFailure(lambda: [0, 0, 1, 0] | should_all.pass_callback(is_one),
+                           'item 0 returned False; item 1 returned False; item 3 returned False')
+
+    def test_describe_apart(self):
+        from hamcrest import assert_that
+        from pyshould.matchers import IsInteger
+        from pyshould.quantifiers import EveryItem
+        # Described apart the value is checked again, so it must be a sequence
+        self.assertFailure(lambda: assert_that([1, 'a'], EveryItem(IsInteger())),
+                           "item 1 was a str 'a'")
+
+    def test_predicate_chunks(self):
+        from pyshould.quantifiers import CHUNK_SIZE
+        lines = ['INFO line %d' % i for i in range(CHUNK_SIZE * 2 + 10)]
+        lines | should_all.match(r'^INFO')
+        lines | should_none.match(r'^ERROR')
+
+        lines[CHUNK_SIZE + 3] = 'ERROR line'
+        self.assertFailure(lambda: lines | should_all.match(r'^INFO'),
+                           "item %d was 'ERROR line'" % (CHUNK_SIZE + 3))
+        self.assertFailure(lambda: iter(lines) | should_none.match(r'^ERROR'),
+                           "item %d was 'ERROR line'" % (CHUNK_SIZE + 3))
+
+        # Iterators are not consumed past the item deciding the outcome
+        consumed = []
+        (str(i) for i in counting(5000, consumed)) | should_any.match('^3$')
+        consumed | should.have_len(4)
+
+        # Items not supported by the predicate are checked by the matcher
+        [b'INFO', 'INFO', memoryview(b'INFO')] | should_all.match(r'^INFO')
+        self.assertFailure(lambda: ['INFO', 5] | should_all.match(r'^INFO'),
+                           'item 1 was not a string but <5>')
+
+
+class ParallelTestCase(FailureTestCase):
+    """ Tests for quantifiers evaluated on pools of workers """
+
+    def test_all(self):
+        list(range(1000)) | should_all.parallel(4).pass_callback(is_positive)
+        self.assertFailure(
+            lambda: list(range(1000)) | should_all.parallel(4, chunksize=10).be_less_than(500),
+            'item 500 was <500>')
+        self.assertFailure(lambda: [] | should_all.parallel(2).be_int,
+                           'was an empty sequence')
+
+    def test_any(self):
+        consumed = []
+        counting(100000, consumed) | should_any.parallel(2, chunksize=10).eq(15)
+        self.assertTrue(len(consumed) < 100000)
+
+        self.assertFailure(lambda: range(100) | should_any.parallel(3).eq(-1),
+                           'no item matched in 100 items starting with <0>, <1>')
+
+    def test_none(self):
+        self.assertFailure(
+            lambda: iter(range(1000)) | should_none.parallel(4, chunksize=7).be_in([10, 900]),
+            'item 10 was <10>')
+
+    def test_process_backend(self):
+        range(100) | should_all.parallel(2, 'process').pass_callback(is_positive)
+        self.assertFailure(
+            lambda: range(-1, 100) | should_all.parallel(2, 'process').pass_callback(is_positive),
+            'item 0 returned False')
+
+    def test_executor_backend(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(2) as executor:
+            checker = should_all.parallel(backend=executor).be_int.compile()
+            checker.check([1, 2, 3])
+            self.assertFalse(checker.matches([1, 'a']))
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, lambda: should_all.parallel(2, 'gpu'))
+
+
+class VectorizedTestCase(FailureTestCase):
+    """ Tests for quantifiers evaluated over NumPy arrays """
+
+    def setUp(self):
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest('NumPy not available, skipping test')
+        self.np = numpy
+
+    def test_all(self):
+        a = self.np.arange(100)
+        a | should_all.be_an_instance_of(self.np.integer).and_greater_than(-1)
+        a.astype(float) | should_all.be_a_float.and_close_to(50, 50)
+        a | should_all.be_an_instance_of(self.np.integer)
+        self.assertFalse(should_all.be_int.matches(self.np.array([], dtype=int)))
+
+        self.assertFailure(lambda: a | should_all.be_less_than(98),
+                           'items at indices [98, 99] were <98>, <99>')
+
+    def test_unsigned_close_to(self):
+        self.np.array([0, 1], dtype='uint8') | should_all.be_close_to(5, 10)
+        self.assertFailure(lambda: self.np.array([0, 1], dtype='uint8') | should_all.be_close_to(5, 4),
+                           'items at indices [0] were <0>')
+
+    def test_types_mirror_items(self):
+        # Type checks give the same result with and without vectorizing
+        for dtype in ('int32', 'int64', 'uint8', 'float64', 'float32', 'bool', 'complex128'):
+            a = self.np.array([1, 0], dtype=dtype)
+            for name in ('be_int', 'be_float', 'be_bool', 'be_numeric', 'be_complex'):
+                vectorized = getattr(should_all, name).matches(a)
+                items = getattr(should_all, name).and_pass_callback(lambda x: True).matches(a)
+                self.assertEqual(vectorized, items, (dtype, name))
+
+    def test_in_mixed_types(self):
+        # Values of other kinds are not coerced to the dtype of the array
+        self.np.array([1, 2, 3]) | should_all.be_in(['a', 1, 2, 3])
+        self.assertFailure(lambda: self.np.array(['1', 'x']) | should_all.be_in([1, 'x']),
+                           'item 0 was')
+        should_all.be_in([1, 'x']).matches(['1', 'x']) | should.be_false
+
+    def test_all_reports_first_indices(self):
+        a = self.np.arange(100)
+        self.assertFailure(lambda: a | should_all.be_less_than(90),
+                           'items at indices [90, 91, 92, 93, 94] (and 5 more)')
+
+    def test_any(self):
+        a = self.np.arange(100)
+        a | should_any.eq(99).or_be_in([200])
+
+        self.assertFailure(lambda: a | should_any.eq(-1),
+                           'no item matched in 100 items')
+
+    def test_none(self):
+        a = self.np.array(['foo', 'bar'])
+        a | should_none.eq('baz')
+
+        self.assertFailure(lambda: a | should_none.eq('bar'),
+                           "items at indices [1] were 'bar'")
+
+    def test_object_arrays(self):
+        a = self.np.array([1, 'a', None], dtype=object)
+        a | should_any.be_a_string
+
+        self.assertFailure(lambda: a | should_all.be_int,
+                           "items at indices [1, 2] were 'a', <None>")
+
+    def test_not_vectorizable(self):
+        a = self.np.arange(10)
+        a | should_all.pass_callback(lambda x: x < 10)
+        self.np.arange(4).reshape(2, 2) | should_all.have_len(2)
+
+    def test_equality(self):
+        self.assertEqual(should_all.be_less_than(10), self.np.arange(10))
+        self.assertNotEqual(should_all.be_less_than(5), self.np.arange(10))